@@ -0,0 +1,114 @@
+"""Compare the batched GUI log handler against sending the GUI a signal per record.
+
+QT_QPA_PLATFORM=offscreen python benchmarks/log_benchmark.py --records 100000
+"""
+import logging
+import threading
+import time
+
+import click
+from PySide2 import QtCore, QtWidgets
+
+from part_map.log_widget import LogWidget
+from part_map.logger import ThreadLogHandler
+
+
+class RecordSignal(QtCore.QObject):
+    """The signal the original handler emitted for every record."""
+
+    new_record = QtCore.Signal(str, str)
+
+
+class PerRecordHandler(logging.Handler):
+    """The original ThreadLogHandler, one queued signal per record."""
+
+    def __init__(self):
+        super().__init__()
+        self.signal = RecordSignal()
+        self.setFormatter(logging.Formatter("%(message)s"))
+
+    def emit(self, record):
+        self.signal.new_record.emit(record.levelname, self.format(record))
+
+
+def run(app, handler, records: int) -> dict:
+    """Log records from a worker thread and process GUI events until all of them arrived."""
+    log = logging.getLogger(f"partmap.benchmark.{type(handler).__name__}")
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    log.addHandler(handler)
+
+    status = QtWidgets.QStatusBar()
+    widget = LogWidget()
+    received = {"records": 0, "deliveries": 0}
+
+    def show_record(level, message):
+        widget.add_records([(level, message)])
+        status.showMessage(message, 5000)
+        received["records"] += 1
+        received["deliveries"] += 1
+
+    def show_records(batch):
+        widget.add_records(batch)
+        status.showMessage(batch[-1][1], 5000)
+        received["records"] += len(batch)
+        received["deliveries"] += 1
+
+    if isinstance(handler, ThreadLogHandler):
+        handler.new_records.connect(show_records)
+    elif isinstance(handler, PerRecordHandler):
+        handler.signal.new_record.connect(show_record)
+    else:
+        received["records"] = records  # Nothing is sent to the GUI.
+
+    emit_time = dict()
+
+    def worker():
+        start = time.perf_counter()
+        for index in range(records):
+            log.info(f"pin {index} parsed")
+        emit_time["seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    thread = threading.Thread(target=worker)
+    thread.start()
+    last = (received["records"], time.perf_counter())
+    while thread.is_alive() or received["records"] < records:
+        app.processEvents()
+        if received["records"] != last[0]:
+            last = (received["records"], time.perf_counter())
+        elif not thread.is_alive() and time.perf_counter() - last[1] > 1:
+            break  # Records were dropped from a full buffer so they will never arrive.
+    total = time.perf_counter() - start
+    log.removeHandler(handler)
+    return {
+        "emit_us": emit_time["seconds"] / records * 1e6,
+        "total": total,
+        "deliveries": received["deliveries"],
+        "records": received["records"],
+    }
+
+
+@click.command()
+@click.option("--records", default=50000, show_default=True, help="Records to log.")
+@click.option("--capacity", default=10000, show_default=True, help="Batched handler buffer.")
+def main(records, capacity):
+    """Time logging a burst of records through each handler until the GUI has shown them."""
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    baseline = logging.Handler()
+    baseline.setFormatter(logging.Formatter("%(message)s"))
+    baseline.emit = baseline.format  # Only pay for formatting the record.
+    for name, handler in (
+        ("format only", baseline),
+        ("per record", PerRecordHandler()),
+        ("batched", ThreadLogHandler(capacity=capacity)),
+    ):
+        result = run(app, handler, records)
+        click.echo(
+            f"{name}: {result['emit_us']:.1f} us per log call, {result['total']:.2f}s until "
+            f"shown, {result['deliveries']} GUI deliveries, {result['records']} records shown"
+        )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=E1120
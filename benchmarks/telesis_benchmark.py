@@ -0,0 +1,73 @@
+"""Compare the chunked Telesis parser against the original sequential parser.
+
+python benchmarks/telesis_benchmark.py --nets 2000000 --workers 1 --workers 4 --workers 8
+"""
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+
+import click
+
+from part_map.telesis import parse_telesis
+
+
+def sequential_parse(filename, refdes):
+    """The original single core parser that PartObject.from_telesis used."""
+    with open(filename, "r") as tel_file:
+        tel_text = tel_file.readlines()
+    tel_netlist = dict()
+    for line in tel_text:
+        reg = re.match(r"(.*);", line)
+        reg2 = re.findall(refdes + r"\.([a-zA-Z0-9]+)", line)
+        if reg and reg2:
+            net = reg.group(1)
+            for reg_match in reg2:
+                pin = reg_match
+                tel_netlist.update({pin: {"name": net, "color": "#ffffff"}})
+    return tel_netlist
+
+
+def generate_netlist(filename: Path, nets: int) -> None:
+    """Write a whole board netlist where U1 is a 50x50 BGA and every net has a few loads."""
+    rows = [chr(ord("A") + index) for index in range(26)] + ["AA", "AB", "AC", "AD"]
+    with open(filename, "w") as net_file:
+        net_file.write("$PACKAGES\nBGA2500 ! FPGA ; U1\n$NETS\n")
+        for index in range(nets):
+            pin = f"{rows[index % len(rows)]}{index % 50 + 1}"
+            loads = " ".join(f"U{2 + (index + load) % 400}.{load + 1}" for load in range(6))
+            net_file.write(f"NET_{index}; U1.{pin} {loads} ,\n")
+            net_file.write(f"     R{index % 1000}.1 C{index % 1000}.2\n")
+        net_file.write("$END\n")
+
+
+@click.command()
+@click.option("--nets", default=500000, show_default=True, help="Nets in the generated file.")
+@click.option("--workers", "-w", multiple=True, type=int, help="Worker counts to time.")
+@click.option("--refdes", default="U1", show_default=True)
+def main(nets, workers, refdes):
+    """Time both parsers on a generated netlist."""
+    workers = workers or (1, os.cpu_count() or 1)
+    with tempfile.TemporaryDirectory() as folder:
+        filename = Path(folder).joinpath("board.net")
+        generate_netlist(filename, nets)
+        click.echo(f"{filename.stat().st_size / 1e6:.1f} MB, {nets} nets")
+
+        start = time.perf_counter()
+        expected = sequential_parse(filename, refdes)
+        baseline = time.perf_counter() - start
+        click.echo(f"sequential: {baseline:.2f}s")
+
+        for count in workers:
+            start = time.perf_counter()
+            result = parse_telesis(filename, refdes, workers=count, min_chunk_size=1024 * 1024)
+            elapsed = time.perf_counter() - start
+            assert result == expected, "chunked parser disagrees with the sequential parser"
+            click.echo(
+                f"chunked, {count} workers: {elapsed:.2f}s ({baseline / elapsed:.1f}x sequential)"
+            )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=E1120
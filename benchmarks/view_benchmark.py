@@ -0,0 +1,95 @@
+"""Time drawing a large part, hit testing it and editing a selection.
+
+QT_QPA_PLATFORM=offscreen python benchmarks/view_benchmark.py --size 50 --size 100 --size 200
+"""
+import random
+import time
+from pathlib import Path
+
+import click
+from PySide2 import QtCore, QtGui, QtWidgets
+
+from part_map.object import PartObject
+from part_map.view import PartViewer
+
+SETTINGS = {"circles": False, "labels": True, "rotate": False, "filename": Path("bench.png")}
+
+
+def generate_part(size: int) -> PartObject:
+    """Create a size x size BGA with every pin populated and one net per column."""
+    letters = "ABCDEFGHJKLMNPRTUVWY"
+    rows = (list(letters) + [first + second for first in letters for second in letters])[:size]
+    columns = [str(index + 1) for index in range(size)]
+    pins = {
+        f"{row}{column}": {"name": f"NET_{column}", "color": "#ffffff"}
+        for row in rows
+        for column in columns
+    }
+    return PartObject(pins, "bench", columns=columns, rows=rows)
+
+
+@click.command()
+@click.option("--size", "-s", multiple=True, type=int, help="Rows and columns of the part.")
+@click.option("--lookups", default=10000, show_default=True, help="Hit tests to time.")
+@click.option("--default-index", is_flag=True, help="Let Qt pick the index depth.")
+def main(size, lookups, default_index):
+    """Time setup, fit_view and hit testing for square parts of each size."""
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    for count in size or (50, 100, 200):
+        view = PartViewer()
+        if default_index:
+            view.configure_index = lambda *args: None
+        part = generate_part(count)
+
+        start = time.perf_counter()
+        view.setup(part, dict(SETTINGS))
+        setup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        view.fit_view()
+        fit = time.perf_counter() - start
+
+        rect = view.grid_rect()
+        points = [
+            QtCore.QPointF(random.uniform(0, rect.width()), random.uniform(0, rect.height()))
+            for _ in range(lookups)
+        ]
+        view.scene.items(points[0])  # Let Qt build the index before timing lookups.
+
+        start = time.perf_counter()
+        for point in points:
+            view.scene.itemAt(point, view.transform())
+        indexed = (time.perf_counter() - start) / lookups
+
+        click.echo(
+            f"{count}x{count} ({count * count} pins): setup {setup * 1000:.0f} ms, "
+            f"fit_view {fit * 1e6:.0f} us, scene.itemAt {indexed * 1e6:.1f} us"
+        )
+
+        # Rubber band the top left quarter, as dragging it in the view would.
+        area = QtGui.QPainterPath()
+        area.addRect(0, 0, rect.width() / 2, rect.height() / 2)
+        start = time.perf_counter()
+        view.scene.setSelectionArea(area)
+        numbers = view.selected_numbers()
+        band = time.perf_counter() - start
+
+        start = time.perf_counter()
+        view.edit_selected(numbers, name="{name}_B", color="#ff0000")
+        edit = time.perf_counter() - start
+
+        view.select_pins(numbers[:1])
+        start = time.perf_counter()
+        net = view.select_net()
+        select_net = time.perf_counter() - start
+        click.echo(
+            f"    rubber band {len(numbers)} pins {band * 1000:.1f} ms, "
+            f"bulk edit {edit * 1000:.1f} ms, select net of {len(net)} pins "
+            f"{select_net * 1000:.1f} ms"
+        )
+        view.deleteLater()
+    app.processEvents()
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=E1120
@@ -0,0 +1,228 @@
+"""Save pin edits in the background without rewriting the whole part on every change.
+
+Edited pins are appended to a journal next to the part as one json line each, which costs the
+same however big the part is.  The journal is named after the whole file the part was loaded
+from, i.e. part.xlsx.journal, so parts whose files only differ in suffix never share one.
+
+A part loaded from .json is compacted every so often: the whole part is written back to its
+.json file and the journal is removed.  Parts loaded from any other format are never written
+without asking, their edits stay in the journal until the part is saved in any format.  Both
+run on a single background thread so they happen in order and never block the GUI.
+
+Loading the same file again replays whatever is left in its journal, unless the file changed
+after the journal was last written and the replay isn't confirmed.
+"""
+import json
+import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from PySide2 import QtCore
+
+JOURNAL_SUFFIX = ".journal"
+STALE_SUFFIX = ".old"
+
+
+class Journal:
+    """Append only log of the pins of a part that changed since it was last compacted."""
+
+    def __init__(self, source):
+        self.source = Path(source)  # The file the part was loaded from.
+        self.filename = self.source.with_name(self.source.name + JOURNAL_SUFFIX)
+
+    @classmethod
+    def for_part(cls, part) -> "Journal":
+        """Return the journal of the file a part was loaded from."""
+        return cls(part.filename)
+
+    def can_compact(self) -> bool:
+        """Return True if the source is a .json file that compact may rewrite."""
+        return self.source.suffix.lower() == ".json"
+
+    def exists(self) -> bool:
+        """Return True if there are edits that have not been compacted."""
+        return self.filename.exists()
+
+    def is_stale(self) -> bool:
+        """Return True if the source was modified after the journal was last written."""
+        return self.source.exists() and (
+            self.source.stat().st_mtime > self.filename.stat().st_mtime
+        )
+
+    def clear(self) -> None:
+        """Forget every edit, once they are saved somewhere else."""
+        if self.exists():
+            self.filename.unlink()
+
+    def set_aside(self) -> Path:
+        """Move the journal out of the way without replaying it, returning where it went."""
+        stale = self.filename.with_name(self.filename.name + STALE_SUFFIX)
+        os.replace(self.filename, stale)
+        return stale
+
+    def append(self, pins: Dict[str, Dict]) -> None:
+        """Record the current {name:, color:} of each edited pin."""
+        lines = "".join(
+            json.dumps({"pin": number, **fields}) + "\n" for number, fields in pins.items()
+        )
+        with open(self.filename, "a") as journal_file:
+            journal_file.write(lines)
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+
+    def read(self) -> Dict[str, Dict]:
+        """Return the last recorded state of every pin in the journal."""
+        pins: Dict[str, Dict] = dict()
+        if not self.exists():
+            return pins
+        with open(self.filename) as journal_file:
+            for line in journal_file:
+                try:
+                    record = json.loads(line)
+                except ValueError:  # The last line of a journal cut short by a crash.
+                    break
+                pins[record.pop("pin")] = record
+        return pins
+
+    def replay(self, part) -> int:
+        """Apply the journal to a part that was loaded from the source, returning the pin count."""
+        pins = self.read()
+        for number, fields in pins.items():
+            if number in part.pins:
+                part.set_pin_name(number, fields["name"])
+                part.set_pin_color(number, fields["color"])
+            else:
+                part.add_pin(number, fields["name"], fields["color"])
+        return len(pins)
+
+    def compact(self, pins: Dict[str, Dict]) -> None:
+        """Write every pin to the .json source and start the journal over."""
+        if not self.can_compact():
+            raise ValueError(f"Only .json parts are compacted, not {self.source}")
+        # Write next to the file and rename so it is never left half written.
+        temp_name = self.source.with_name(f"{self.source.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_name, "w") as outfile:
+                json.dump(pins, outfile, sort_keys=True, indent=4, separators=(",", ": "))
+            os.replace(temp_name, self.source)
+        except BaseException:
+            if temp_name.exists():
+                temp_name.unlink()
+            raise
+        if self.exists():
+            self.filename.unlink()
+
+
+class AutoSaver(QtCore.QObject):
+    """Journal the pins the view edits and periodically compact them into the part's .json file.
+
+    Edits are coalesced for delay milliseconds after the last one so a burst of edits costs a
+    single append, and the journal is compacted every compact_interval milliseconds.
+    """
+
+    def __init__(self, view, delay: int = 1000, compact_interval: int = 60000, parent=None):
+        super().__init__(parent)
+        self.log = logging.getLogger("partmap.autosave")
+        self.view = view
+        self.part = None
+        self.journal: Optional[Journal] = None
+        self._pending: Dict[str, Dict] = dict()
+        self._dirty = False  # Appended to the journal since it was last compacted.
+        self._executor = ThreadPoolExecutor(max_workers=1)  # One thread keeps writes in order.
+
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(delay)
+        self._flush_timer.timeout.connect(self.flush)
+
+        self._compact_timer = QtCore.QTimer(self)
+        self._compact_timer.setInterval(compact_interval)
+        self._compact_timer.timeout.connect(self.compact)
+
+        self.view.pin_edited.connect(self.queue)
+
+    def start(self, part, confirm: Callable[[Journal], bool] = None) -> int:
+        """Compact the last part and journal the edits of a new one.
+
+        A journal left behind by a previous session of the same file is replayed.  If the file
+        changed since, the edits may no longer apply, so they are only replayed if confirm is
+        given and returns True, otherwise the journal is set aside.  Returns how many pins were
+        recovered.
+        """
+        self.compact()
+        self._dirty = False  # A part that is only journaled was never compacted.
+        self.part = part
+        self.journal = Journal.for_part(part)
+        recovered = 0
+        if self.journal.exists() and self.journal.is_stale():
+            if confirm is None or not confirm(self.journal):
+                stale = self.journal.set_aside()
+                self.log.warning(f"{part.filename} changed after its edits, moved them to {stale}")
+        if self.journal.exists():
+            recovered = self.journal.replay(part)
+            self._dirty = True
+            self.log.info(f"Recovered {recovered} edited pins from {self.journal.filename}")
+        if not self.journal.can_compact():
+            self.log.debug(f"Edits are kept in {self.journal.filename} until the part is saved")
+        self._compact_timer.start()
+        return recovered
+
+    def queue(self, numbers: List[str]) -> None:
+        """Remember the pins that changed and write them once the edits pause."""
+        if self.part is None:
+            return
+        for number in numbers:
+            pin = self.part.get_pin(number, "")
+            self._pending[number] = {"name": pin["name"], "color": pin["color"]}
+        self._flush_timer.start()
+
+    def flush(self) -> Optional[Future]:
+        """Append the pending pins to the journal in the background."""
+        self._flush_timer.stop()
+        if not self._pending:
+            return None
+        pins, self._pending = self._pending, dict()
+        self._dirty = True
+        return self.submit(self.journal.append, pins)
+
+    def compact(self) -> Optional[Future]:
+        """Write the whole part in the background if anything changed since the last time.
+
+        Parts that weren't loaded from .json only have their edits journaled.
+        """
+        self.flush()
+        if not self._dirty or not self.journal.can_compact():
+            return None
+        self._dirty = False
+        # Copy the pins here so the background thread never reads a pin that is being edited.
+        pins = {number: dict(pin) for number, pin in self.part.as_dict().items()}
+        return self.submit(self.journal.compact, pins)
+
+    def saved(self) -> Optional[Future]:
+        """Start the journal over once the part was saved, the edits are in the saved file now."""
+        if self.journal is None:
+            return None
+        self.flush()
+        self._dirty = False
+        return self.submit(self.journal.clear)
+
+    def close(self) -> None:
+        """Compact any edits and wait for the writes to finish."""
+        self._compact_timer.stop()
+        self.compact()
+        self._executor.shutdown(wait=True)
+        self.part = None
+
+    def submit(self, function, *args) -> Future:
+        """Run a journal operation on the background thread and log it if it fails."""
+        future = self._executor.submit(function, *args)
+        future.add_done_callback(self._report)
+        return future
+
+    def _report(self, future: Future) -> None:
+        """Log the error of a background write that failed."""
+        error = future.exception()
+        if error is not None:
+            self.log.error(f"Autosave failed: {error}")
@@ -1,10 +1,20 @@
 """Console scripts for prototype."""
+import json
+import os
+import signal
 import sys
+from pathlib import Path
 
 import click
 from PySide2 import QtWidgets
 
+from part_map.formats import get_formats
+from part_map.logger import setup_logger
+from part_map.object import PartObject
 from part_map.part_map import PartMap
+from part_map.render_cache import RenderManifest
+from part_map.server import start_server
+from part_map.view import export_key
 
 
 @click.group(
@@ -29,12 +39,14 @@ def map(ctx):
 @click.option("--no-labels", is_flag=True, help="Disable the text labels.")
 @click.option("--save", "-s", is_flag=True, help="Save the image as a .png.")
 @click.option("--dump", "-d", is_flag=True, help="Dump PartObject as a Json File.")
+@click.option(
+    "--excel", "-e", is_flag=True, help="Dump PartObject as an Excel File (<part>_pinout.xlsx)."
+)
+@click.option("--pmap", "-p", is_flag=True, help="Dump PartObject as a binary .pmap File.")
 @click.option("--nogui", "-n", is_flag=True, help="Do not open GUI window.")
+@click.option("--force", "-f", is_flag=True, help="Save the image even if it is up to date.")
 def load(filename, **kwargs) -> None:
     """Open the Part Map GUI and load a file for viewing."""
-
-    app = QtWidgets.QApplication([])
-
     settings = {
         "refdes": kwargs["refdes"],
         "rotate": kwargs["rotate"],
@@ -42,15 +54,71 @@ def load(filename, **kwargs) -> None:
         "labels": not kwargs["no_labels"],
     }
 
-    gui = PartMap(filename, settings)
+    # When the image is all there is to do, check it is out of date before building any window.
+    part = None
+    exports = kwargs["dump"] or kwargs["excel"] or kwargs["pmap"]
+    if kwargs["save"] and kwargs["nogui"] and not exports and not kwargs["force"]:
+        log = setup_logger("partmap")
+        part = PartObject.from_file(filename, settings["refdes"])
+        output = Path(filename).with_suffix(".png")
+        if RenderManifest(output.parent).is_current(output, export_key(part, settings)):
+            log.info(f"{output} is up to date")
+            return
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    gui = PartMap(filename, settings, part)
 
     if not kwargs["nogui"]:
         gui.show()
     if kwargs["dump"]:
         gui.save_json()
+    if kwargs["excel"]:
+        gui.save_excel()
+    if kwargs["pmap"]:
+        gui.save_pmap()
     if kwargs["save"]:
-        gui.save_image()
+        gui.save_image(kwargs["force"])
     if kwargs["nogui"]:
         app.closeAllWindows()
     else:
         sys.exit(app.exec_())
+
+
+@map.command()
+def formats() -> None:
+    """List the file formats parts can be loaded from."""
+    for part_format in get_formats():
+        click.echo(
+            f"{part_format.name:10} {' '.join(part_format.suffixes):20} {part_format.description}"
+        )
+
+
+@map.command()
+@click.argument("filename", type=click.Path(exists=True))
+@click.option("--refdes", default="", help="The refdes to pull from the Telesis.")
+@click.option(
+    "--region-size", default=8, show_default=True, help="Rows/columns per density region."
+)
+def stats(filename, refdes, region_size) -> None:
+    """Print the net statistics of a part as json."""
+    part = PartObject.from_file(filename, refdes)
+    click.echo(json.dumps(part.count_statistics(region_size).summary(), indent=4))
+
+
+@map.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="The address to bind to.")
+@click.option("--port", "-p", default=8000, show_default=True, help="The port to listen on.")
+@click.option(
+    "--cache-size", default=64, show_default=True, help="How many parts and renders to cache."
+)
+def serve(host, port, cache_size) -> None:
+    """Run a local HTTP server that renders parts on demand."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QtWidgets.QApplication([])
+    signal.signal(signal.SIGINT, signal.SIG_DFL)  # Let Ctrl+C stop the Qt event loop.
+    setup_logger("partmap")
+    server = start_server(host, port, cache_size)
+    try:
+        app.exec_()
+    finally:
+        server.shutdown()
@@ -0,0 +1,195 @@
+"""Read and write the Excel cell fills used to color a PartObject."""
+import colorsys
+import re
+from typing import Any, Dict, List, Optional
+from xml.etree import ElementTree
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import Cell
+from openpyxl.styles import PatternFill
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.styles.colors import COLOR_INDEX
+
+DEFAULT_COLOR = "#ffffff"
+
+DRAWINGML = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+# Excel indexes theme colors with the light/dark pairs swapped from the theme xml order.
+THEME_ORDER = [
+    "lt1",
+    "dk1",
+    "lt2",
+    "dk2",
+    "accent1",
+    "accent2",
+    "accent3",
+    "accent4",
+    "accent5",
+    "accent6",
+    "hlink",
+    "folHlink",
+]
+
+
+def get_theme_colors(workbook) -> List[str]:
+    """Return the workbook theme palette as RRGGBB strings in Excel's theme index order."""
+    if not workbook.loaded_theme:
+        return []
+    root = ElementTree.fromstring(workbook.loaded_theme)
+    scheme = root.find(f"{DRAWINGML}themeElements/{DRAWINGML}clrScheme")
+    if scheme is None:
+        return []
+    colors = dict()
+    for entry in scheme:
+        name = entry.tag.replace(DRAWINGML, "")
+        for color in entry:
+            rgb = color.get("lastClr") or color.get("val")
+            if rgb:
+                colors[name] = rgb.upper()
+    return [colors.get(name, "FFFFFF") for name in THEME_ORDER]
+
+
+def apply_tint(rgb: str, tint: float) -> str:
+    """Lighten or darken a RRGGBB color by an Excel tint in the range [-1, 1]."""
+    if not tint:
+        return rgb
+    red, green, blue = (int(rgb[index : index + 2], 16) / 255.0 for index in (0, 2, 4))
+    hue, lightness, saturation = colorsys.rgb_to_hls(red, green, blue)
+    if tint < 0:
+        lightness = lightness * (1.0 + tint)
+    else:
+        lightness = lightness * (1.0 - tint) + tint
+    red, green, blue = colorsys.hls_to_rgb(hue, lightness, saturation)
+    return "".join(f"{round(channel * 255):02X}" for channel in (red, green, blue))
+
+
+class FillColorCache:
+    """Resolve the fill of each distinct cell style once and reuse it for every cell.
+
+    Cells only store the index of their style in the workbook's style table, so a sheet with
+    thousands of rows normally references a handful of styles.  Caching on that index means the
+    cost of parsing scales with the number of unique styles instead of the number of cells.
+    """
+
+    def __init__(self, workbook):
+        self.theme_colors = get_theme_colors(workbook)
+        self.indexed_colors = list(workbook._colors or COLOR_INDEX)  # pylint: disable=W0212
+        self._fills = workbook._fills  # pylint: disable=W0212
+        self._cell_styles = workbook._cell_styles  # pylint: disable=W0212
+        self._cache: Dict[int, str] = dict()
+
+    def get_color(self, cell) -> str:
+        """Return the fill color of a cell as #RRGGBB, white if the cell isn't solid filled."""
+        style_id = getattr(cell, "_style_id", None)
+        if style_id is None:  # Normal and empty cells don't carry a read-only style id.
+            style_id = cell.style_id if hasattr(cell, "style_id") else 0
+        try:
+            return self._cache[style_id]
+        except KeyError:
+            color = self.resolve_style(style_id)
+            self._cache[style_id] = color
+            return color
+
+    def resolve_style(self, style_id: int) -> str:
+        """Look up the fill of a style and convert it into a hex color."""
+        fill = self._fills[self._cell_styles[style_id].fillId]
+        if getattr(fill, "patternType", None) != "solid":
+            return DEFAULT_COLOR
+        return self.resolve_color(fill.fgColor)
+
+    def resolve_color(self, color) -> str:
+        """Convert an openpyxl color of any type (rgb, indexed, theme) to #RRGGBB."""
+        rgb = None
+        if color.type == "rgb" and isinstance(color.rgb, str):
+            rgb = color.rgb[-6:]
+        elif color.type == "indexed" and color.indexed < len(self.indexed_colors):
+            rgb = self.indexed_colors[color.indexed][-6:]
+        elif color.type == "theme" and color.theme < len(self.theme_colors):
+            rgb = self.theme_colors[color.theme]
+        if rgb is None:
+            return DEFAULT_COLOR
+        return "#" + apply_tint(rgb, color.tint)
+
+
+def to_argb(color: Optional[str]) -> Optional[str]:
+    """Convert a #RRGGBB or 0xRRGGBB color to Excel's AARRGGBB, None if it can't be filled."""
+    match = re.fullmatch(r"(?:#|0x)?([0-9a-fA-F]{6})", str(color))
+    if not match or match.group(1).lower() == DEFAULT_COLOR[1:]:
+        return None  # White is the unfilled default so leave the cell without a fill.
+    return "FF" + match.group(1).upper()
+
+
+class ExcelPinWriter:
+    """Stream pins into a write-only workbook where every fill color shares one cell style.
+
+    Rows are serialized as soon as they are appended so memory stays flat no matter how many pins
+    are exported, and each color is added to the workbook's style table exactly once.
+    """
+
+    def __init__(self):
+        self.workbook = Workbook(write_only=True)
+        self._styles: Dict[str, Optional[StyleArray]] = dict()
+
+    def create_sheet(self, title: str):
+        """Add a new write-only sheet to the workbook."""
+        return self.workbook.create_sheet(title)
+
+    def cell(self, sheet, value: Any, color: Optional[str] = None) -> Cell:
+        """Create a cell with a solid fill of the given color."""
+        try:
+            style = self._styles[color]
+        except KeyError:
+            style = self.get_style(color)
+            self._styles[color] = style
+        return Cell(sheet, row=1, column=1, value=value, style_array=style)
+
+    def get_style(self, color: Optional[str]) -> Optional[StyleArray]:
+        """Register a solid fill for the color and return the style that references it."""
+        argb = to_argb(color)
+        if argb is None:
+            return None
+        style = StyleArray()
+        fill = PatternFill("solid", fgColor=argb)
+        style.fillId = self.workbook._fills.add(fill)  # pylint: disable=W0212
+        return style
+
+    def save(self, filename) -> None:
+        """Write the workbook to disk, after which no more rows can be added."""
+        self.workbook.save(filename)
+
+
+def read_excel(filename) -> Dict:
+    """Read the Number and Name columns of the first sheet into {pin: {name:, color:}}."""
+    number = "Number"
+    name = "Name"
+    workbook = load_workbook(filename, read_only=True, data_only=True)
+    sheet = workbook.active  # Grab the first sheet
+    colors = FillColorCache(workbook)
+    try:
+        column = get_col_index([number, name], sheet)
+        pin_index = column[number] - 1
+        name_index = column[name] - 1
+        bga = dict()
+        for excel_row in sheet.iter_rows(min_row=2):
+            if len(excel_row) <= max(pin_index, name_index):
+                continue
+            pin = excel_row[pin_index].value
+            net = excel_row[name_index]
+            if pin is not None or net.value is not None:
+                bga.update({pin: {"name": net.value, "color": colors.get_color(net)}})
+    except (TypeError, ValueError, KeyError, UnboundLocalError) as error:
+        print(error)
+        raise
+    finally:
+        workbook.close()
+    return bga
+
+
+def get_col_index(name: List, worksheet) -> Dict:
+    """ return a list of the column numbers if it matches """
+    indexes = dict()
+    for rows in worksheet.iter_rows(min_row=1, max_row=1, min_col=1):
+        for column in rows:
+            if column.value in name:
+                indexes.update({column.value: column.column})
+    return indexes
@@ -0,0 +1,179 @@
+"""Registry of the file formats a part can be loaded from.
+
+Each format names its loader as a ``"module:attribute"`` string so the module, and anything
+heavy it imports such as openpyxl, is only imported once that format has been picked.  The
+format is picked by sniffing at most SNIFF_SIZE bytes from the start of the file; formats whose
+suffix matches are tried first, then every other format.
+
+Other packages can add formats through the ``part_map.formats`` entry point group by pointing
+at a PartFormat instance::
+
+    entry_points={"part_map.formats": ["kicad = my_package.formats:KICAD_FORMAT"]}
+"""
+import importlib
+import logging
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+SNIFF_SIZE = 4096
+
+ENTRY_POINT_GROUP = "part_map.formats"
+
+
+class UnknownFormatError(ValueError):
+    """No registered format recognized the file."""
+
+
+class PartFormat(NamedTuple):
+    """A file format and how to recognize and load it."""
+
+    name: str
+    description: str
+    suffixes: Tuple[str, ...]
+    loader: str  # "module:attribute" of a callable(filename, **options) returning a PartObject
+    sniff: Callable[[bytes], bool]  # Given the first SNIFF_SIZE bytes of the file.
+    options: Tuple[str, ...] = ()  # The load settings passed on to the loader, i.e. refdes.
+
+    def load(self, filename, **settings):
+        """Import the loader and create a PartObject from the file."""
+        module_name, _, attribute = self.loader.partition(":")
+        loader = importlib.import_module(module_name)
+        for name in attribute.split("."):
+            loader = getattr(loader, name)
+        return loader(filename, **{key: settings[key] for key in self.options if key in settings})
+
+
+def sniff_json(header: bytes) -> bool:
+    """Json parts are a single object."""
+    return header.lstrip(b"\xef\xbb\xbf \t\r\n").startswith(b"{")
+
+
+def sniff_excel(header: bytes) -> bool:
+    """Excel 2007+ workbooks are zip archives."""
+    return header.startswith(b"PK\x03\x04")
+
+
+TELESIS_NET = re.compile(rb"^[^;\r\n]+;\s*\S+\.\S+", re.MULTILINE)
+
+
+def sniff_telesis(header: bytes) -> bool:
+    """Telesis netlists have $ sections or lines of NET; REFDES.PIN."""
+    return b"$PACKAGES" in header or b"$NETS" in header or bool(TELESIS_NET.search(header))
+
+
+def sniff_pmap(header: bytes) -> bool:
+    """Binary parts start with their magic number."""
+    return header.startswith(b"PMAP")
+
+
+_FORMATS: Dict[str, PartFormat] = dict()
+_plugins_loaded = False  # pylint: disable=C0103
+
+
+def register_format(part_format: PartFormat) -> None:
+    """Add a format to the registry, replacing any format with the same name."""
+    _FORMATS[part_format.name] = part_format
+
+
+def load_plugins() -> None:
+    """Register the formats advertised by installed packages, once."""
+    global _plugins_loaded  # pylint: disable=C0103,W0603
+    if _plugins_loaded:
+        return
+    _plugins_loaded = True
+    log = logging.getLogger("partmap.formats")
+    for entry_point in iter_entry_points():
+        try:
+            register_format(entry_point.load())
+        except Exception as error:  # pylint: disable=W0703
+            log.error(f"Failed to load the {entry_point.name} format plugin: {error}")
+
+
+def iter_entry_points() -> List:
+    """Return the entry points of the format plugin group on any supported Python."""
+    try:
+        from importlib.metadata import entry_points  # pylint: disable=C0415
+    except ImportError:  # Python < 3.8
+        import pkg_resources  # pylint: disable=C0415
+
+        return list(pkg_resources.iter_entry_points(ENTRY_POINT_GROUP))
+    found = entry_points()
+    if hasattr(found, "select"):
+        return list(found.select(group=ENTRY_POINT_GROUP))
+    return list(found.get(ENTRY_POINT_GROUP, []))
+
+
+def get_formats() -> List[PartFormat]:
+    """Return every registered format, including plugins."""
+    load_plugins()
+    return list(_FORMATS.values())
+
+
+def detect_format(filename) -> PartFormat:
+    """Pick the format of a file from its suffix and the first few KB of its contents."""
+    filename = Path(filename)
+    with open(filename, "rb") as part_file:
+        header = part_file.read(SNIFF_SIZE)
+    formats = get_formats()
+    suffix = filename.suffix.lower()
+    candidates = [fmt for fmt in formats if suffix in fmt.suffixes]
+    candidates += [fmt for fmt in formats if suffix not in fmt.suffixes]
+    for part_format in candidates:
+        if part_format.sniff(header):
+            return part_format
+    raise UnknownFormatError(f"{filename} is not a recognized part file")
+
+
+def load_part(filename, part_format: Optional[str] = None, **settings):
+    """Load a part with the named format, or whichever format the file looks like."""
+    if part_format is None:
+        found = detect_format(filename)
+    else:
+        get_formats()
+        if part_format not in _FORMATS:
+            raise UnknownFormatError(f"{part_format} is not a registered format")
+        found = _FORMATS[part_format]
+    return found.load(Path(filename), **settings)
+
+
+def file_filter() -> str:
+    """Return a QFileDialog filter covering every registered format."""
+    formats = get_formats()
+    every = " ".join(f"*{suffix}" for fmt in formats for suffix in fmt.suffixes)
+    filters = [f"Part Map File ({every})"]
+    filters += [
+        f"{fmt.description} ({' '.join(f'*{suffix}' for suffix in fmt.suffixes)})"
+        for fmt in formats
+    ]
+    filters.append("All Files (*)")
+    return ";;".join(filters)
+
+
+register_format(
+    PartFormat("json", "Json", (".json",), "part_map.object:PartObject.from_json", sniff_json)
+)
+register_format(
+    PartFormat(
+        "excel",
+        "Excel",
+        (".xlsx", ".xlsm", ".xltm"),
+        "part_map.object:PartObject.from_excel",
+        sniff_excel,
+    )
+)
+register_format(
+    PartFormat(
+        "telesis",
+        "Telesis",
+        (".net", ".txt"),
+        "part_map.object:PartObject.from_telesis",
+        sniff_telesis,
+        ("refdes",),
+    )
+)
+register_format(
+    PartFormat(
+        "pmap", "Binary Part", (".pmap",), "part_map.object:PartObject.from_pmap", sniff_pmap
+    )
+)
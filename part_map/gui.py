@@ -25,6 +25,19 @@ class Ui_MainWindow(object):
         self.actionSave_as_Image.setObjectName("actionSave_as_Image")
         self.actionSave_as_Json = QAction(MainWindow)
         self.actionSave_as_Json.setObjectName("actionSave_as_Json")
+        self.actionSave_as_Excel = QAction(MainWindow)
+        self.actionSave_as_Excel.setObjectName("actionSave_as_Excel")
+        self.actionUndo = QAction(MainWindow)
+        self.actionUndo.setObjectName("actionUndo")
+        self.actionRedo = QAction(MainWindow)
+        self.actionRedo.setObjectName("actionRedo")
+        self.actionSelect_Mode = QAction(MainWindow)
+        self.actionSelect_Mode.setObjectName("actionSelect_Mode")
+        self.actionSelect_Mode.setCheckable(True)
+        self.actionSelect_Net = QAction(MainWindow)
+        self.actionSelect_Net.setObjectName("actionSelect_Net")
+        self.actionEdit_Selection = QAction(MainWindow)
+        self.actionEdit_Selection.setObjectName("actionEdit_Selection")
         self.actionExit = QAction(MainWindow)
         self.actionExit.setObjectName("actionExit")
         self.actionRotate = QAction(MainWindow)
@@ -61,6 +74,8 @@ class Ui_MainWindow(object):
         self.menubar.setGeometry(QRect(0, 0, 800, 24))
         self.menuFile = QMenu(self.menubar)
         self.menuFile.setObjectName("menuFile")
+        self.menuEdit = QMenu(self.menubar)
+        self.menuEdit.setObjectName("menuEdit")
         self.menuOptions = QMenu(self.menubar)
         self.menuOptions.setObjectName("menuOptions")
         self.menuView = QMenu(self.menubar)
@@ -79,13 +94,21 @@ class Ui_MainWindow(object):
         MainWindow.addDockWidget(Qt.RightDockWidgetArea, self.properties)
 
         self.menubar.addAction(self.menuFile.menuAction())
+        self.menubar.addAction(self.menuEdit.menuAction())
         self.menubar.addAction(self.menuOptions.menuAction())
         self.menubar.addAction(self.menuView.menuAction())
         self.menuFile.addAction(self.actionOpen)
         self.menuFile.addAction(self.actionSave_as_Image)
         self.menuFile.addAction(self.actionSave_as_Json)
+        self.menuFile.addAction(self.actionSave_as_Excel)
         self.menuFile.addSeparator()
         self.menuFile.addAction(self.actionExit)
+        self.menuEdit.addAction(self.actionUndo)
+        self.menuEdit.addAction(self.actionRedo)
+        self.menuEdit.addSeparator()
+        self.menuEdit.addAction(self.actionSelect_Mode)
+        self.menuEdit.addAction(self.actionSelect_Net)
+        self.menuEdit.addAction(self.actionEdit_Selection)
         self.menuOptions.addAction(self.actionRotate)
         self.menuOptions.addAction(self.actionToggle_Shape)
         self.menuOptions.addAction(self.actionToggle_Labels)
@@ -121,6 +144,44 @@ class Ui_MainWindow(object):
             QCoreApplication.translate("MainWindow", "Ctrl+S", None)
         )
         # endif // QT_CONFIG(shortcut)
+        self.actionSave_as_Excel.setText(
+            QCoreApplication.translate("MainWindow", "Save as Excel", None)
+        )
+        # if QT_CONFIG(shortcut)
+        self.actionSave_as_Excel.setShortcut(
+            QCoreApplication.translate("MainWindow", "Ctrl+E", None)
+        )
+        # endif // QT_CONFIG(shortcut)
+        self.actionUndo.setText(QCoreApplication.translate("MainWindow", "Undo", None))
+        # if QT_CONFIG(shortcut)
+        self.actionUndo.setShortcut(QCoreApplication.translate("MainWindow", "Ctrl+Z", None))
+        # endif // QT_CONFIG(shortcut)
+        self.actionRedo.setText(QCoreApplication.translate("MainWindow", "Redo", None))
+        # if QT_CONFIG(shortcut)
+        self.actionRedo.setShortcut(QCoreApplication.translate("MainWindow", "Ctrl+Shift+Z", None))
+        # endif // QT_CONFIG(shortcut)
+        self.actionSelect_Mode.setText(
+            QCoreApplication.translate("MainWindow", "Box Select", None)
+        )
+        # if QT_CONFIG(shortcut)
+        self.actionSelect_Mode.setShortcut(
+            QCoreApplication.translate("MainWindow", "Ctrl+B", None)
+        )
+        # endif // QT_CONFIG(shortcut)
+        self.actionSelect_Net.setText(QCoreApplication.translate("MainWindow", "Select Net", None))
+        # if QT_CONFIG(shortcut)
+        self.actionSelect_Net.setShortcut(
+            QCoreApplication.translate("MainWindow", "Ctrl+Shift+N", None)
+        )
+        # endif // QT_CONFIG(shortcut)
+        self.actionEdit_Selection.setText(
+            QCoreApplication.translate("MainWindow", "Edit Selection", None)
+        )
+        # if QT_CONFIG(shortcut)
+        self.actionEdit_Selection.setShortcut(
+            QCoreApplication.translate("MainWindow", "Ctrl+Shift+E", None)
+        )
+        # endif // QT_CONFIG(shortcut)
         self.actionExit.setText(QCoreApplication.translate("MainWindow", "Exit", None))
         # if QT_CONFIG(shortcut)
         self.actionExit.setShortcut(QCoreApplication.translate("MainWindow", "Ctrl+Q", None))
@@ -178,6 +239,7 @@ class Ui_MainWindow(object):
         self.actionReset_Zoom.setShortcut(QCoreApplication.translate("MainWindow", "Ctrl+0", None))
         # endif // QT_CONFIG(shortcut)
         self.menuFile.setTitle(QCoreApplication.translate("MainWindow", "File", None))
+        self.menuEdit.setTitle(QCoreApplication.translate("MainWindow", "Edit", None))
         self.menuOptions.setTitle(QCoreApplication.translate("MainWindow", "Options", None))
         self.menuView.setTitle(QCoreApplication.translate("MainWindow", "View", None))
 
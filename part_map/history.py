@@ -0,0 +1,81 @@
+"""Undo and redo history of the edits made to the pins of a part."""
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class PinEdit(NamedTuple):
+    """One field of one pin changing from old to new."""
+
+    number: str
+    field: str  # "name" or "color"
+    old: str
+    new: str
+
+
+class EditHistory:
+    """A bounded log of edits that can be undone and redone.
+
+    Each entry is a tuple of PinEdits that are undone together.  Edits made inside group() are
+    collected into a single entry so a bulk edit of many pins is one step to undo.
+    """
+
+    def __init__(self, max_depth: int = 1000):
+        self._undo: Deque[Tuple[PinEdit, ...]] = deque(maxlen=max_depth)
+        self._redo: List[Tuple[PinEdit, ...]] = list()
+        self._group: Optional[List[PinEdit]] = None
+        self._depth = 0
+
+    def record(self, edits: List[PinEdit]) -> None:
+        """Add edits that were just applied to the part."""
+        edits = [edit for edit in edits if edit.old != edit.new]
+        if not edits:
+            return
+        if self._group is not None:
+            self._group.extend(edits)
+            return
+        self._undo.append(tuple(edits))
+        self._redo.clear()
+
+    @contextmanager
+    def group(self) -> Iterator[None]:
+        """Collect every edit recorded inside the block into one undo step."""
+        self._depth += 1
+        if self._group is None:
+            self._group = list()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                edits, self._group = self._group, None
+                self.record(edits)
+
+    def can_undo(self) -> bool:
+        """Return True if there is an edit to undo."""
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        """Return True if there is an undone edit to redo."""
+        return bool(self._redo)
+
+    def undo(self) -> Tuple[PinEdit, ...]:
+        """Return the edits to reverse, in the order they should be reversed."""
+        if not self._undo:
+            return tuple()
+        edits = self._undo.pop()
+        self._redo.append(edits)
+        return tuple(PinEdit(edit.number, edit.field, edit.new, edit.old) for edit in edits[::-1])
+
+    def redo(self) -> Tuple[PinEdit, ...]:
+        """Return the edits to apply again."""
+        if not self._redo:
+            return tuple()
+        edits = self._redo.pop()
+        self._undo.append(edits)
+        return edits
+
+    def clear(self) -> None:
+        """Forget every edit, i.e. when a new part is loaded."""
+        self._undo.clear()
+        self._redo.clear()
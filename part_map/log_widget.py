@@ -0,0 +1,68 @@
+"""Widget showing the log messages of the application."""
+from collections import deque
+from typing import List, Tuple
+
+from PySide2 import QtWidgets
+
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
+
+class LogWidget(QtWidgets.QWidget):
+    """Show the most recent log messages, filtered by level and text.
+
+    Messages arrive in batches and each batch is appended to the text in one go so a burst of
+    logging costs one layout, not one per message.
+    """
+
+    def __init__(self, max_records: int = 5000, parent=None):
+        super().__init__(parent)
+        self.records: deque = deque(maxlen=max_records)
+
+        self.level = QtWidgets.QComboBox()
+        self.level.addItems(LEVELS[1:])  # The GUI handler only receives INFO and above.
+        self.level.currentIndexChanged.connect(self.refresh)
+        self.search = QtWidgets.QLineEdit()
+        self.search.setPlaceholderText(self.tr("Filter"))
+        self.search.setClearButtonEnabled(True)
+        self.search.textChanged.connect(self.refresh)
+        clear = QtWidgets.QPushButton(self.tr("Clear"))
+        clear.clicked.connect(self.clear)
+
+        self.text = QtWidgets.QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setMaximumBlockCount(max_records)
+
+        filters = QtWidgets.QHBoxLayout()
+        filters.addWidget(self.level)
+        filters.addWidget(self.search)
+        filters.addWidget(clear)
+        layout = QtWidgets.QVBoxLayout()
+        layout.addLayout(filters)
+        layout.addWidget(self.text)
+        self.setLayout(layout)
+
+    def matches(self, level: str, message: str) -> bool:
+        """Return True if a message passes the level and text filters."""
+        minimum = LEVELS.index(self.level.currentText())
+        if level in LEVELS and LEVELS.index(level) < minimum:
+            return False
+        return self.search.text().lower() in message.lower()
+
+    def add_records(self, records: List[Tuple[str, str]]) -> None:
+        """Keep a batch of (level, message) records and show the ones that pass the filters."""
+        self.records.extend(records)
+        shown = [message for level, message in records if self.matches(level, message)]
+        if shown:
+            self.text.appendPlainText("\n".join(shown))
+
+    def refresh(self) -> None:
+        """Show the kept records again after a filter changed."""
+        self.text.setPlainText(
+            "\n".join(message for level, message in self.records if self.matches(level, message))
+        )
+        self.text.moveCursor(self.text.textCursor().End)
+
+    def clear(self) -> None:
+        """Forget every record."""
+        self.records.clear()
+        self.text.clear()
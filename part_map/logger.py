@@ -1,44 +1,96 @@
 """The logging and debug functionality for prototype."""
 import logging
+import threading
+from collections import deque
 from logging import Logger, LogRecord
+from typing import Deque, List, Tuple
 
-from PySide2.QtCore import QObject, Signal
+from PySide2.QtCore import QObject, Qt, QTimer, Signal
+
+CONSOLE_HANDLER = "partmap.console"
 
 
 def setup_logger(root_name: str) -> Logger:
-    """Create a console logger."""
+    """Create a console logger, only adding the console handler the first time."""
     log = logging.getLogger(root_name)
+    log.setLevel(logging.DEBUG)
+    if any(handler.get_name() == CONSOLE_HANDLER for handler in log.handlers):
+        return log
 
     # Setup a Console Logger
     console_handler = logging.StreamHandler()
+    console_handler.set_name(CONSOLE_HANDLER)
     ch_format = logging.Formatter("%(message)s")
     console_handler.setFormatter(ch_format)
     console_handler.setLevel(logging.DEBUG)
     log.addHandler(console_handler)
 
-    log.setLevel(logging.DEBUG)
-
     return log
 
 
 class LogQObject(QObject):
-    """Create a dummy object to get around the PySide multiple inheritance problem."""
+    """Create a dummy object to get around the PySide multiple inheritance problem.
+
+    It lives on the GUI thread, where the timer that delivers the buffered records runs.
+    """
 
-    new_record = Signal(str, str)
+    new_records = Signal(list)
+    wake = Signal()
+
+    def __init__(self, interval: int, parent=None):
+        super().__init__(parent)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval)
+        self.wake.connect(self.timer.start, Qt.QueuedConnection)
 
 
 class ThreadLogHandler(logging.Handler):
-    """Create a custom logging handler that appends each record to the TextEdit Widget."""
+    """Create a custom logging handler that sends records to the GUI in batches.
+
+    Records from any thread are formatted into a ring buffer of at most capacity records, the
+    oldest being dropped once it is full.  The first record after a delivery schedules the next
+    one interval milliseconds later, so the GUI thread receives at most one new_records signal
+    per interval however fast records arrive, and none while nothing is logged.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, capacity: int = 10000, interval: int = 100) -> None:
         super().__init__()
-        self.log = LogQObject()
-        self.new_record = self.log.new_record
+        self.log = LogQObject(interval)
+        self.new_records = self.log.new_records
+        self.log.timer.timeout.connect(self.deliver)
         self.setFormatter(logging.Formatter("%(message)s"))
         self.setLevel(logging.INFO)
 
+        self.buffer: Deque[Tuple[str, str]] = deque(maxlen=capacity)
+        self.dropped = 0  # Records pushed out of the buffer before they were delivered.
+        self._scheduled = False
+        self._buffer_lock = threading.Lock()
+
     def emit(self, record: LogRecord) -> None:
-        """Append the record to the Widget."""
-        msg = self.format(record)
-        level = record.levelname
-        self.new_record.emit(level, msg)
+        """Buffer the record and schedule a delivery if one isn't already pending."""
+        try:
+            entry = (record.levelname, self.format(record))
+        except Exception:  # pylint: disable=W0703
+            self.handleError(record)
+            return
+        with self._buffer_lock:
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+            self.buffer.append(entry)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.log.wake.emit()
+
+    def deliver(self) -> None:
+        """Send every buffered record to the GUI as one (level, message) list."""
+        with self._buffer_lock:
+            records: List[Tuple[str, str]] = list(self.buffer)
+            self.buffer.clear()
+            dropped, self.dropped = self.dropped, 0
+            self._scheduled = False
+        if dropped:
+            records.insert(0, ("WARNING", f"{dropped} log messages were dropped"))
+        if records:
+            self.new_records.emit(records)
@@ -0,0 +1,128 @@
+"""Overview of the whole part for navigating a zoomed in view."""
+from typing import List
+
+from PySide2 import QtCore, QtGui, QtWidgets
+
+# Past this many edited pins one render of the whole part is cheaper than one render per pin.
+REFRESH_LIMIT = 64
+
+
+class Minimap(QtWidgets.QWidget):
+    """Show the whole part with the visible area outlined and jump to wherever is clicked.
+
+    The part is rendered into a small pixmap once after the view draws it.  Edits only re-render
+    the pins that changed and scrolling or zooming the view only repaints this widget, which is a
+    pixmap blit and a rectangle.
+    """
+
+    def __init__(self, view, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.pixmap = QtGui.QPixmap()
+        self.source = QtCore.QRectF()  # The scene area the pixmap covers.
+        self.scale = 1.0
+        self.setMinimumSize(160, 160)
+        self.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+
+        # Drawing the part can happen several times in a row (rotate, then setup) so coalesce
+        # the requests into a single rebuild once control returns to the event loop.
+        self._rebuild_timer = QtCore.QTimer(self)
+        self._rebuild_timer.setSingleShot(True)
+        self._rebuild_timer.timeout.connect(self.rebuild)
+
+        self.view.rendered.connect(self.schedule_rebuild)
+        self.view.pin_edited.connect(self.refresh_pins)
+        self.view.horizontalScrollBar().valueChanged.connect(self.update)
+        self.view.verticalScrollBar().valueChanged.connect(self.update)
+        self.view.horizontalScrollBar().rangeChanged.connect(self.update)
+        self.view.verticalScrollBar().rangeChanged.connect(self.update)
+
+    def schedule_rebuild(self) -> None:
+        """Rebuild the pixmap the next time the event loop is idle."""
+        self._rebuild_timer.start(0)
+
+    def rebuild(self) -> None:
+        """Render the whole scene into the downscaled pixmap."""
+        self.source = self.view.sceneRect()
+        if self.source.isEmpty() or not self.isVisible():
+            return
+        self.scale = min(self.width() / self.source.width(), self.height() / self.source.height())
+        size = QtCore.QSize(
+            max(1, int(self.source.width() * self.scale)),
+            max(1, int(self.source.height() * self.scale)),
+        )
+        self.pixmap = QtGui.QPixmap(size)
+        self.pixmap.fill(QtCore.Qt.white)
+        painter = QtGui.QPainter(self.pixmap)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        self.view.scene.render(painter, QtCore.QRectF(self.pixmap.rect()), self.source)
+        painter.end()
+        self.update()
+
+    def refresh_pins(self, numbers: List[str]) -> None:
+        """Re-render only the pins that changed into the pixmap."""
+        if self.pixmap.isNull():
+            return
+        if len(numbers) > REFRESH_LIMIT:
+            self.schedule_rebuild()
+            return
+        painter = QtGui.QPainter(self.pixmap)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        for number in numbers:
+            item = self.view.pin_items.get(number)
+            if item is None:
+                continue
+            source = item.sceneBoundingRect().adjusted(-4, -4, 4, 4)  # Include the thick pen.
+            painter.fillRect(self.to_minimap(source), QtCore.Qt.white)
+            self.view.scene.render(painter, self.to_minimap(source), source)
+        painter.end()
+        self.update()
+
+    def to_minimap(self, rect: QtCore.QRectF) -> QtCore.QRectF:
+        """Map a rectangle in the scene to the pixmap."""
+        return QtCore.QRectF(
+            (rect.x() - self.source.x()) * self.scale,
+            (rect.y() - self.source.y()) * self.scale,
+            rect.width() * self.scale,
+            rect.height() * self.scale,
+        )
+
+    def to_scene(self, point: QtCore.QPoint) -> QtCore.QPointF:
+        """Map a point on this widget to the scene."""
+        return QtCore.QPointF(
+            point.x() / self.scale + self.source.x(), point.y() / self.scale + self.source.y()
+        )
+
+    def paintEvent(self, event):
+        """Draw the cached pixmap and outline the area the view is showing."""
+        del event  # Unused
+        painter = QtGui.QPainter(self)
+        painter.drawPixmap(0, 0, self.pixmap)
+        if not self.pixmap.isNull():
+            visible = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+            painter.setPen(QtGui.QPen(QtGui.QColor(255, 0, 0), 2))
+            painter.setBrush(QtCore.Qt.NoBrush)
+            painter.drawRect(
+                self.to_minimap(visible).intersected(QtCore.QRectF(self.pixmap.rect()))
+            )
+        painter.end()
+
+    def mousePressEvent(self, event):
+        """Center the view on the point that was clicked."""
+        if not self.pixmap.isNull():
+            self.view.centerOn(self.to_scene(event.pos()))
+
+    def mouseMoveEvent(self, event):
+        """Drag the view around while the mouse button is held."""
+        if event.buttons() & QtCore.Qt.LeftButton and not self.pixmap.isNull():
+            self.view.centerOn(self.to_scene(event.pos()))
+
+    def resizeEvent(self, event):
+        """Render the pixmap again at the new size."""
+        super().resizeEvent(event)
+        self.schedule_rebuild()
+
+    def showEvent(self, event):
+        """The pixmap is skipped while hidden so build it when the dock is shown."""
+        super().showEvent(event)
+        self.schedule_rebuild()
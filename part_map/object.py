@@ -3,73 +3,66 @@ import json
 import logging
 import re
 from pathlib import Path
-from typing import Dict, List, Tuple, Union
+from typing import TYPE_CHECKING, Dict, List, Tuple, Union
 
 from natsort import natsorted
-from openpyxl import load_workbook
+
+from .formats import load_part
+
+if TYPE_CHECKING:
+    from .stats import PartStatistics
+
+# The format specific modules are imported by the methods that use them so loading one format
+# doesn't import the others.
 
 
 class PartObject:
     """ Load and create a part from a source """
 
-    def __init__(self, pins, filename):
+    def __init__(self, pins, filename, columns=None, rows=None):
         super().__init__()
         self.log = logging.getLogger("partmap.object")
         self._pins = pins
-        self._columns, self._rows = self.sort_and_split_pin_list()
+        if columns is None or rows is None:
+            self._columns, self._rows = self.sort_and_split_pin_list()
+        else:
+            self._columns, self._rows = columns, rows
+        self._layout = (list(self._columns), list(self._rows))  # Unaffected by view rotation.
+        self._statistics = None
         self.filename = Path(filename)
 
     @classmethod
     def from_excel(cls, filename):
         """ Import an Excel and create a PartObject """
-        number = "Number"
-        name = "Name"
-        workbook = load_workbook(filename)
-        sheet = workbook.active  # Grab the first sheet
-        try:
-            column = get_col_index([number, name], sheet)
-            bga = dict()
-            for excel_row in range(2, sheet.max_row + 1):
-                pin = sheet.cell(row=excel_row, column=column[number]).value
-                net = sheet.cell(row=excel_row, column=column[name])
-                if pin is not None or net.value is not None:
-                    if net.fill.patternType == "solid":
-                        bga.update(
-                            {
-                                pin: {
-                                    "name": net.value,
-                                    "color": str("#" + net.fill.start_color.rgb[2:]),
-                                }
-                            }
-                        )
-                    else:
-                        bga.update({pin: {"name": net.value, "color": "#ffffff"}})
-        except (TypeError, ValueError, KeyError, UnboundLocalError) as error:
-            print(error)
-            raise
-        return cls(bga, filename)
+        from .excel import read_excel  # pylint: disable=C0415  # Only import openpyxl if needed.
+
+        return cls(read_excel(filename), filename)
 
     @classmethod
-    def from_telesis(cls, filename, refdes):
+    def from_telesis(cls, filename, refdes, workers=None):
         """ Import a Telesis formatted file and create a PartObject """
-        with open(filename, "r") as tel_file:
-            tel_text = tel_file.readlines()
-        tel_netlist = dict()
-        for line in tel_text:
-            reg = re.match(r"(.*);", line)
-            reg2 = re.findall(refdes + r"\.([a-zA-Z0-9]+)", line)
-            if reg and reg2:
-                net = reg.group(1)
-                for reg_match in reg2:
-                    pin = reg_match
-                    tel_netlist.update({pin: {"name": net, "color": "#ffffff"}})
-        return cls(tel_netlist, filename)
+        from .telesis import parse_telesis  # pylint: disable=C0415
+
+        return cls(parse_telesis(filename, refdes, workers), filename)
 
     @classmethod
     def from_json(cls, filename):
         """ Import a json file with a format {pin: {name:, color:}} """
         return cls(json.load(open(filename)), filename)
 
+    @classmethod
+    def from_pmap(cls, filename):
+        """ Open a memory mapped .pmap file whose pins are only decoded when accessed """
+        from .pmap import PmapPins  # pylint: disable=C0415
+
+        pins = PmapPins(filename)
+        return cls(pins, filename, list(pins.columns), list(pins.rows))
+
+    @classmethod
+    def from_file(cls, filename, refdes: str = ""):
+        """ Create a PartObject with whichever registered format the file looks like """
+        return load_part(filename, refdes=refdes)
+
     def add_pin(self, pin: str, net: str, color: str) -> None:
         """Add a new pin to the part.
 
@@ -78,8 +71,40 @@ class PartObject:
             net: The functional name of the net. (USB_P)
             color: The color to fill with.
         """
+        if self._statistics is not None:
+            if pin in self._pins:
+                self._statistics.remove(pin, self._pins[pin]["name"])
+            self._statistics.add(pin, net)
         self._pins.update({pin: {"name": net, "color": color}})
 
+    def set_pin_name(self, number: str, name: str) -> None:
+        """Rename the net of an existing pin."""
+        pin = self._pins[number]
+        if self._statistics is not None:
+            self._statistics.rename(number, pin["name"], name)
+        pin["name"] = name
+
+    def set_pin_color(self, number: str, color: str) -> None:
+        """Change the fill color of an existing pin."""
+        self._pins[number]["color"] = color
+
+    @property
+    def statistics(self) -> "PartStatistics":
+        """ Net statistics, counted once on first use and then updated as pins change """
+        if self._statistics is None:
+            self._statistics = self.count_statistics()
+        return self._statistics
+
+    def count_statistics(self, region_size: int = 8) -> "PartStatistics":
+        """ Count the net statistics of every pin in the part """
+        from .stats import PartStatistics  # pylint: disable=C0415,W0621
+
+        columns, rows = self._layout
+        statistics = PartStatistics(rows, columns, region_size)
+        for number in self.pins:
+            statistics.add(number, self._pins[number]["name"])
+        return statistics
+
     @property
     def columns(self) -> List:
         """ Get the columns in a part. [1-n] """
@@ -100,20 +125,44 @@ class PartObject:
         """Update the rows."""
         self._rows = new_rows
 
-    def get_pin(self, prefix: str, suffix: str) -> Union[str, None]:
+    def get_pin(self, prefix: str, suffix: str) -> Union[Dict, None]:
         """ Get the name and color of a pin """
-        pin = None
+        number = self.get_pin_number(prefix, suffix)
+        if number is None:
+            return None
+        return self._pins[number]
+
+    def get_pin_number(self, prefix: str, suffix: str) -> Union[str, None]:
+        """ Get the pin number of a row and column in either order (A1 or 1A) """
         if prefix + suffix in self._pins:
-            pin = self._pins[prefix + suffix]
-        elif suffix + prefix in self._pins:
-            pin = self._pins[suffix + prefix]
-        return pin
+            return prefix + suffix
+        if suffix + prefix in self._pins:
+            return suffix + prefix
+        return None
 
     @property
     def pins(self):
         """ Return the pin names """
         return self._pins.keys()
 
+    def as_dict(self) -> Dict:
+        """ Return the pins as a dictionary of {pin: {name:, color:}} """
+        if isinstance(self._pins, dict):
+            return self._pins
+        # A lazily decoded .pmap part, the pin dictionaries are still the part's own.
+        return {number: pin for number, pin in self._pins.items()}
+
+    def close(self) -> None:
+        """ Release the memory map of a part loaded from a .pmap file """
+        if not isinstance(self._pins, dict):  # A .pmap part.
+            self._pins.close()
+
+    def __enter__(self) -> "PartObject":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
     def get_number_of_pins(self):
         """ Return how many pins are in the part """
         return len(self._pins)
@@ -126,8 +175,69 @@ class PartObject:
         """ Dump the PartObject dictionary to a .json file """
         save_file = self.filename.with_suffix(".json")
         self.log.info(f"Saved as json to {save_file}")
+        pins = self.as_dict()
         with open(save_file, "w") as outfile:
-            json.dump(self._pins, outfile, sort_keys=True, indent=4, separators=(",", ": "))
+            json.dump(pins, outfile, sort_keys=True, indent=4, separators=(",", ": "))
+
+    def dump_pmap(self, filename=None, skip_unplaced: bool = False):
+        """Dump the PartObject to a memory mappable binary .pmap file.
+
+        Raises PmapError if a pin doesn't fit the row/column grid unless skip_unplaced is set.
+        """
+        from .pmap import write_pmap  # pylint: disable=C0415
+
+        save_file = Path(filename) if filename else self.filename.with_suffix(".pmap")
+        columns, rows = self.sort_and_split_pin_list()
+        mapped = not isinstance(self._pins, dict) and self._pins.filename.resolve()
+        if mapped == save_file.resolve():
+            # Windows can't replace a file that is mapped, so read every pin and unmap it first.
+            pins = self.as_dict()
+            self.close()
+            self._pins = pins
+        write_pmap(save_file, self._pins, rows, columns, skip_unplaced)
+        self.log.info(f"Saved as pmap to {save_file}")
+
+    def dump_excel(self, filename=None, grid: bool = True):
+        """Dump the PartObject to an Excel file that can be loaded again with from_excel.
+
+        The first sheet lists each pin's Number and Name with the name filled in the pin's color.
+        If grid is set, a second sheet lays the pins out in the same rows and columns as the view.
+        It is written to <part>_pinout.xlsx by default and never over the file the part came from,
+        which for a part loaded from Excel is a workbook this export can't reproduce.
+        """
+        # Only import openpyxl if needed.
+        from .excel import ExcelPinWriter  # pylint: disable=C0415
+
+        if filename:
+            save_file = Path(filename)
+        else:
+            save_file = self.filename.with_name(f"{self.filename.stem}_pinout.xlsx")
+        if save_file.resolve() == self.filename.resolve():
+            raise ValueError(f"Refusing to overwrite {self.filename}, the part was loaded from it")
+        writer = ExcelPinWriter()
+
+        pin_sheet = writer.create_sheet("Pins")
+        pin_sheet.append(["Number", "Name"])
+        for number in natsorted(self._pins, key=str):
+            pin = self._pins[number]
+            pin_sheet.append([number, writer.cell(pin_sheet, pin["name"], pin["color"])])
+
+        if grid:
+            grid_sheet = writer.create_sheet("Layout")
+            grid_sheet.append(list(self.columns))
+            for row in self.rows:
+                cells = list()
+                for column in self.columns:
+                    pin = self.get_pin(str(row), str(column))
+                    if pin:
+                        cells.append(writer.cell(grid_sheet, pin["name"], pin["color"]))
+                    else:
+                        cells.append(None)
+                cells.append(row)
+                grid_sheet.append(cells)
+
+        writer.save(save_file)
+        self.log.info(f"Saved as excel to {save_file}")
 
     def sort_and_split_pin_list(self) -> Tuple[List, List]:
         """ Take a list of pins and spilt by letter and number then sort """
@@ -148,13 +258,3 @@ class PartObject:
         temp2 = natsorted(temp2)
         temp2.extend(natsorted(temp))
         return natsorted(set(c_list)), temp2
-
-
-def get_col_index(name: List, worksheet) -> Dict:
-    """ return a list of the column numbers if it matches """
-    indexes = dict()
-    for rows in worksheet.iter_rows(min_row=1, max_row=1, min_col=1):
-        for column in rows:
-            if column.value in name:
-                indexes.update({column.value: column.col_idx})
-    return indexes
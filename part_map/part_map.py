@@ -1,17 +1,23 @@
 """Main Window of Part Map"""
 from pathlib import Path
 
-from PySide2 import QtWidgets
+from PySide2 import QtCore, QtWidgets
 
+from .autosave import AutoSaver
+from .formats import file_filter
 from .gui import Ui_MainWindow
+from .log_widget import LogWidget
 from .logger import ThreadLogHandler, setup_logger
+from .minimap import Minimap
 from .object import PartObject
+from .pins.bulk import BulkEditWidget
+from .summary import SummaryWidget
 
 
 class PartMap(QtWidgets.QMainWindow, Ui_MainWindow):
     """Main Part Map Window."""
 
-    def __init__(self, filename=None, settings=None):
+    def __init__(self, filename=None, settings=None, part=None):
         QtWidgets.QMainWindow.__init__(self)
         self.log = setup_logger("partmap")
 
@@ -38,13 +44,50 @@ class PartMap(QtWidgets.QMainWindow, Ui_MainWindow):
         self.setupUi(self)
         self.properties.setVisible(False)
         self.menubar.setNativeMenuBar(False)
+        self.setup_summary()
+        self.setup_minimap()
+        self.setup_log()
+        self.autosave = AutoSaver(self.view, parent=self)
         self.connect_actions()
 
-        thread_log = ThreadLogHandler()
-        self.log.addHandler(thread_log)
-        thread_log.new_record.connect(self.log_message)
+        self.thread_log = ThreadLogHandler()
+        self.log.addHandler(self.thread_log)
+        self.thread_log.new_records.connect(self.log_messages)
         if filename:
-            self.load_file(Path(filename))
+            self.load_file(Path(filename), part)
+
+    def setup_summary(self):
+        """Create the dock that summarizes the nets of the part."""
+        # pylint: disable=W0201
+        self.summary = QtWidgets.QDockWidget(self.tr("Summary"), self)
+        self.summary.setObjectName("summary")
+        self.summary_widget = SummaryWidget()
+        self.summary.setWidget(self.summary_widget)
+        self.addDockWidget(QtCore.Qt.RightDockWidgetArea, self.summary)
+        self.summary.setVisible(False)
+        self.menuView.addSeparator()
+        self.menuView.addAction(self.summary.toggleViewAction())
+
+    def setup_minimap(self):
+        """Create the dock with an overview of the whole part."""
+        # pylint: disable=W0201
+        self.minimap = QtWidgets.QDockWidget(self.tr("Overview"), self)
+        self.minimap.setObjectName("minimap")
+        self.minimap_widget = Minimap(self.view)
+        self.minimap.setWidget(self.minimap_widget)
+        self.addDockWidget(QtCore.Qt.LeftDockWidgetArea, self.minimap)
+        self.menuView.addAction(self.minimap.toggleViewAction())
+
+    def setup_log(self):
+        """Create the dock that lists the log messages."""
+        # pylint: disable=W0201
+        self.log_dock = QtWidgets.QDockWidget(self.tr("Log"), self)
+        self.log_dock.setObjectName("log")
+        self.log_widget = LogWidget()
+        self.log_dock.setWidget(self.log_widget)
+        self.addDockWidget(QtCore.Qt.BottomDockWidgetArea, self.log_dock)
+        self.log_dock.setVisible(False)
+        self.menuView.addAction(self.log_dock.toggleViewAction())
 
     def connect_actions(self):
         """Connect any actions to slots."""
@@ -52,6 +95,12 @@ class PartMap(QtWidgets.QMainWindow, Ui_MainWindow):
         self.actionOpen.triggered.connect(self.prompt_user_for_file)
         self.actionSave_as_Image.triggered.connect(self.save_image)
         self.actionSave_as_Json.triggered.connect(self.save_json)
+        self.actionSave_as_Excel.triggered.connect(self.prompt_save_excel)
+        self.actionUndo.triggered.connect(self.undo)
+        self.actionRedo.triggered.connect(self.redo)
+        self.actionSelect_Mode.toggled.connect(self.view.set_select_mode)
+        self.actionSelect_Net.triggered.connect(self.select_net)
+        self.actionEdit_Selection.triggered.connect(self.edit_selection)
         self.actionRotate.triggered.connect(self.rotate)
         self.actionToggle_Shape.triggered.connect(self.change_shape)
         self.actionToggle_Labels.triggered.connect(self.toggle_labels)
@@ -60,11 +109,12 @@ class PartMap(QtWidgets.QMainWindow, Ui_MainWindow):
         self.actionDecrease_Font_Size.triggered.connect(self.decrease_font)
         self.actionIncrease_Font_Size.triggered.connect(self.increase_font)
         self.actionReset_Zoom.triggered.connect(self.reset_zoom)
+        self.view.pin_edited.connect(self.update_summary)
 
-    def log_message(self, level, msg) -> None:
-        """Log any logger messages via the slot/signal mechanism so that its thread safe."""
-        del level  # Unused
-        self.statusbar.showMessage(msg, timeout=5000)  # Miliseconds
+    def log_messages(self, records) -> None:
+        """Show a batch of (level, message) records, sent by a signal so it is thread safe."""
+        self.log_widget.add_records(records)
+        self.statusbar.showMessage(records[-1][1], timeout=5000)  # Miliseconds
 
     def prompt_user_for_file(self):
         """Load a file into the gui."""
@@ -72,29 +122,47 @@ class PartMap(QtWidgets.QMainWindow, Ui_MainWindow):
             self,
             self.tr("Load Project"),
             "",
-            self.tr("Part Map File (*.json *.net *.txt *.xlsx *.xlsm *.xltm)"),
+            file_filter(),
         )
         if filename:
             self.load_file(Path(filename))
 
-    def load_file(self, filename: Path):
-        """Read in a file and create a part."""
+    def load_file(self, filename: Path, part=None):
+        """Read in a file and create a part, unless the part read from it is given."""
         self.setWindowTitle(filename.stem)
         self.log.info(f"Filename: {filename}")
-        if filename.suffix in [".xlsx", ".xlsm", ".xltm"]:
-            self.part = PartObject.from_excel(filename)
-        elif filename.suffix in [".json"]:
-            self.part = PartObject.from_json(filename)
-        elif filename.suffix in [".net", ".txt"]:
-            self.part = PartObject.from_telesis(filename, self.settings["refdes"])
+        if part is None:
+            part = PartObject.from_file(filename, self.settings["refdes"])
+        self.part = part
+        # Only ask while the window is up, a script loading a part can't answer.
+        self.autosave.start(self.part, self.confirm_replay if self.isVisible() else None)
 
         self.settings.update({"filename": filename})
         self.view.setup(self.part, self.settings)
+        self.update_summary()
 
-    def save_image(self):
-        """Save the view as an image."""
+    def confirm_replay(self, journal) -> bool:
+        """Ask whether to apply edits that were journaled before the file last changed."""
+        answer = QtWidgets.QMessageBox.question(
+            self,
+            self.tr("Recover Edits"),
+            self.tr(
+                f"{journal.source.name} changed after the edits in {journal.filename.name} were "
+                "made. Apply them anyway?"
+            ),
+        )
+        return answer == QtWidgets.QMessageBox.Yes
+
+    def update_summary(self, numbers=None):
+        """Refresh the summary dock from the part's statistics."""
+        del numbers  # The statistics are already up to date, only the widget needs a refresh.
+        if self.part:
+            self.summary_widget.update_statistics(self.part.statistics)
+
+    def save_image(self, force: bool = False):
+        """Save the view as an image, skipped if the last image saved is up to date."""
         if self.view:
-            self.view.save()
+            self.view.save(force)
         else:
             self.log.error("View doesn't exist")
 
@@ -102,9 +170,79 @@ class PartMap(QtWidgets.QMainWindow, Ui_MainWindow):
         """Save the part as json."""
         if self.part:
             self.part.dump_json()
+            self.autosave.saved()
         else:
             self.log.error("Part doesn't exist")
 
+    def save_excel(self, filename=None):
+        """Save the part as an excel workbook, <part>_pinout.xlsx unless a filename is given."""
+        if not self.part:
+            self.log.error("Part doesn't exist")
+            return
+        try:
+            self.part.dump_excel(filename)
+        except ValueError as error:
+            self.log.error(str(error))
+            return
+        self.autosave.saved()
+
+    def prompt_save_excel(self):
+        """Ask the user where to save the part as an excel workbook."""
+        if not self.part:
+            self.log.error("Part doesn't exist")
+            return
+        default = self.part.filename.with_name(f"{self.part.filename.stem}_pinout.xlsx")
+        filename, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self,
+            self.tr("Save as Excel"),
+            str(default),
+            "Excel (*.xlsx)",
+        )
+        if filename:
+            self.save_excel(Path(filename))
+
+    def save_pmap(self):
+        """Save the part as a binary .pmap file."""
+        if not self.part:
+            self.log.error("Part doesn't exist")
+            return
+        try:
+            self.part.dump_pmap()
+        except ValueError as error:
+            self.log.error(str(error))
+            return
+        self.autosave.saved()
+
+    def undo(self):
+        """Revert the last pin edit."""
+        if self.part:
+            self.view.undo()
+
+    def redo(self):
+        """Apply the last undone pin edit again."""
+        if self.part:
+            self.view.redo()
+
+    def select_net(self):
+        """Select every pin on the nets of the selected pins."""
+        if self.part:
+            numbers = self.view.select_net()
+            self.log.info(f"Selected {len(numbers)} pins")
+
+    def edit_selection(self):
+        """Show the widget that edits every selected pin at once."""
+        numbers = self.view.selected_numbers() if self.part else []
+        if numbers:
+            self.set_properties_widget(BulkEditWidget(self.view, numbers))
+        else:
+            self.log.error("No pins are selected")
+
+    def closeEvent(self, event):
+        """Finish writing any edits before the window closes."""
+        self.autosave.close()
+        self.log.removeHandler(self.thread_log)
+        super().closeEvent(event)
+
     def rotate(self):
         """Rotate the view."""
         if self.view:
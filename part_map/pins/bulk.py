@@ -0,0 +1,78 @@
+"""Widget to allow the user to edit the color and names of many pins at once."""
+import logging
+from string import Formatter
+from typing import List, Tuple
+
+from PySide2 import QtGui, QtWidgets
+
+from part_map.pmap import split_pin
+
+
+def expand_names(pattern: str, pins: List[Tuple[str, str]]) -> List[str]:
+    """Fill in a name pattern for each (number, current name) pin.
+
+    The pattern may use {name} for the pin's current name, {pin} for its number, {row} and
+    {column} for the parts of its number and {n} for its position in the list, i.e. "DQ{n}" or
+    "{name}_N".  A pattern without any of them is used as the name as is.  Anything else,
+    including attribute or index access like {name.upper} or {n[0]}, raises a ValueError.
+    """
+    try:
+        fields = {field for _, field, _, _ in Formatter().parse(pattern) if field is not None}
+        for field in fields:
+            if "." in field or "[" in field:
+                raise ValueError(f"{{{field}}} can't access attributes or items")
+        if not fields:
+            return [pattern.format()] * len(pins)  # format() still turns {{ into {.
+        names = list()
+        for index, (number, name) in enumerate(pins):
+            row, column = split_pin(str(number)) if fields & {"row", "column"} else ("", "")
+            names.append(pattern.format(name=name, pin=number, row=row, column=column, n=index))
+        return names
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError) as error:
+        raise ValueError(f"Invalid name pattern {pattern!r}: {error}") from error
+
+
+class BulkEditWidget(QtWidgets.QWidget):
+    """The widget for a selection of pins, only changing the fields the user touched."""
+
+    def __init__(self, view, numbers: List[str], parent=None):
+        super().__init__(parent)
+        self.log = logging.getLogger("partmap.pins")
+        self.view = view
+        self.numbers = numbers
+        self.color = None
+
+        self.name_edit = QtWidgets.QLineEdit()
+        self.name_edit.setPlaceholderText("Unchanged, or a pattern like DQ{n} or {name}_N")
+        self.name_edit.setToolTip("Use {name}, {pin}, {row}, {column} and {n} in the pattern.")
+        self.color_button = QtWidgets.QPushButton("Unchanged")
+        self.apply_button = QtWidgets.QPushButton("Apply")
+
+        layout = QtWidgets.QFormLayout()
+        layout.addRow(QtWidgets.QLabel(f"{len(numbers)} pins selected"))
+        layout.addRow("Name", self.name_edit)
+        layout.addRow("Color", self.color_button)
+        layout.addRow(self.apply_button)
+        self.setLayout(layout)
+
+        # Connect Signal/Slots
+        self.color_button.clicked.connect(self.change_color)
+        self.name_edit.returnPressed.connect(self.apply)
+        self.apply_button.clicked.connect(self.apply)
+
+    def change_color(self):
+        """Pick the color to fill every selected pin with."""
+        color = QtWidgets.QColorDialog.getColor(self.color or QtGui.QColor("#ffffff"))
+        if not color.isValid():  # The user cancelled the dialog.
+            return
+        self.color = color
+        self.color_button.setText(self.color.name())
+
+    def apply(self):
+        """Apply the name pattern and/or color to every selected pin as one edit."""
+        pattern = self.name_edit.text() or None
+        color = self.color.name() if self.color else None
+        try:
+            self.view.edit_selected(self.numbers, pattern, color)
+        except ValueError as error:
+            self.log.error(str(error))
@@ -9,7 +9,8 @@ class Pin(QtCore.QObject, QtWidgets.QGraphicsItem):
 
     clicked = QtCore.Signal(object)
 
-    def __init__(self, pin, rect, show_label=True, view=None, parent=None):
+    # pylint: disable=R0913
+    def __init__(self, pin, rect, show_label=True, view=None, number=None, parent=None):
         QtCore.QObject.__init__(self, parent)
         QtWidgets.QGraphicsItem.__init__(self, parent)
         self.setFlags(self.ItemIsSelectable)
@@ -19,6 +20,7 @@ class Pin(QtCore.QObject, QtWidgets.QGraphicsItem):
         self.rect = rect
 
         self.pin = pin
+        self.number = number
         self.show_label = show_label
 
     @property
@@ -66,5 +68,6 @@ class Pin(QtCore.QObject, QtWidgets.QGraphicsItem):
                 name = self.pin["name"][:7]
             else:
                 name = self.pin["name"]
-            painter.drawText(self.rect, QtCore.Qt.AlignCenter | QtCore.Qt.AlignHCenter, name)
+            # The int overload, some PySide2 builds overflow converting alignment flags.
+            painter.drawText(self.rect, int(QtCore.Qt.AlignCenter), name)
         painter.restore()
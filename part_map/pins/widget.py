@@ -27,12 +27,14 @@ class PinWidget(QtWidgets.QWidget):
     def change_color(self):
         """Update the color."""
         color_picker = QtWidgets.QColorDialog(self.color)
-        self.color = color_picker.getColor()
+        color = color_picker.getColor()
+        if not color.isValid():  # The user cancelled the dialog.
+            return
+        self.color = color
         self.color_button.setText(self.color.name())
-        self.pin_item.pin["color"] = self.color.name()
-        self.pin_item.update()
+        self.pin_item.view.edit_pin(self.pin_item.number, color=self.color.name())
 
     def change_name(self):
         """Update the Name"""
-        self.pin_item.pin["name"] = self.name_edit.text()
-        self.pin_item.update()
+        if self.name_edit.text() != self.pin_item.pin["name"]:
+            self.pin_item.view.edit_pin(self.pin_item.number, name=self.name_edit.text())
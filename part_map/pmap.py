@@ -0,0 +1,309 @@
+"""A memory mapped binary part format that decodes pins only when they are accessed.
+
+Layout of a version 1 .pmap file, all integers little endian:
+
+    header      magic, version, counts and the offset of each section (HEADER)
+    strings     string_count + 1 uint32 offsets into the blob followed by the utf-8 blob
+    palette     color_count uint32 string ids
+    rows        row_count uint32 string ids
+    columns     column_count uint32 string ids
+    records     row_count * column_count fixed width pin records (RECORD)
+
+Net names, pin numbers and colors are interned in the string table so each distinct value is
+stored once.  The record for a pin lives at ``(row * column_count + column) * RECORD.size`` so
+a pin is found with arithmetic instead of a search.
+"""
+import logging
+import mmap
+import os
+import re
+import struct
+import tempfile
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+MAGIC = b"PMAP"
+VERSION = 1
+
+# magic, version, flags, pins, rows, columns, strings, colors, then the section offsets.
+HEADER = struct.Struct("<4sHHIIIIIQQQQ")
+# pin number string id, net name string id, palette index
+RECORD = struct.Struct("<III")
+UINT32 = struct.Struct("<I")
+EMPTY = 0xFFFFFFFF
+
+
+class PmapError(ValueError):
+    """The file isn't a .pmap file or was written by an unsupported version."""
+
+
+def split_pin(number: str) -> Tuple[str, str]:
+    """Split a pin number into its row and column the same way the PartObject does."""
+    split = re.split(r"(\d+)", number)
+    if len(split) < 2:
+        return split[0], ""
+    return split[0], split[1]
+
+
+class StringTable:
+    """Intern strings while writing and hand back their ids."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = dict()
+        self.strings: List[bytes] = list()
+
+    def add(self, value) -> int:
+        """Return the id of the string, adding it to the table if it is new."""
+        value = "" if value is None else str(value)
+        try:
+            return self.ids[value]
+        except KeyError:
+            self.ids[value] = len(self.strings)
+            self.strings.append(value.encode("utf-8"))
+            return self.ids[value]
+
+    def pack(self) -> bytes:
+        """Pack the offsets and the blob of the table."""
+        offsets = [0]
+        for string in self.strings:
+            offsets.append(offsets[-1] + len(string))
+        return struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(self.strings)
+
+
+def write_pmap(
+    filename, pins: Dict, rows: List[str], columns: List[str], skip_unplaced: bool = False
+) -> None:
+    """Write the pins out as a .pmap file laid out on the rows and columns given.
+
+    Pins whose number isn't a row and column of the grid, i.e. A1B, have no record to go in so
+    PmapError is raised rather than losing them, unless skip_unplaced is set.  The file is written
+    next to the destination and then moved over it so a .pmap that is currently memory mapped is
+    never truncated underneath its reader.
+    """
+    log = logging.getLogger("partmap.pmap")
+    filename = Path(filename)
+    strings = StringTable()
+    palette: Dict[str, int] = dict()
+    row_ids = [strings.add(row) for row in rows]
+    column_ids = [strings.add(column) for column in columns]
+
+    records = bytearray(RECORD.size * len(rows) * len(columns))
+    placed = set()
+    for row_index, row in enumerate(rows):
+        for column_index, column in enumerate(columns):
+            number = None
+            for candidate in (f"{row}{column}", f"{column}{row}"):
+                if candidate in pins:
+                    number = candidate
+                    break
+            if number is None:
+                RECORD.pack_into(
+                    records, (row_index * len(columns) + column_index) * RECORD.size, EMPTY, 0, 0
+                )
+                continue
+            pin = pins[number]
+            color = palette.setdefault(pin["color"], len(palette))
+            RECORD.pack_into(
+                records,
+                (row_index * len(columns) + column_index) * RECORD.size,
+                strings.add(number),
+                strings.add(pin["name"]),
+                color,
+            )
+            placed.add(number)
+    pin_count = len(placed)
+    if pin_count != len(pins):
+        unplaced = [number for number in pins if number not in placed]
+        if not skip_unplaced:
+            raise PmapError(
+                f"{len(unplaced)} pins don't fit the row/column grid of a .pmap file: "
+                f"{', '.join(map(str, unplaced[:10]))}"
+            )
+        log.warning(f"{len(unplaced)} pins don't fit the row/column grid and were skipped")
+    palette_ids = [strings.add(color) for color in palette]
+
+    string_bytes = strings.pack()
+    strings_offset = HEADER.size
+    palette_offset = strings_offset + len(string_bytes)
+    grid_offset = palette_offset + UINT32.size * len(palette_ids)
+    records_offset = grid_offset + UINT32.size * (len(row_ids) + len(column_ids))
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        pin_count,
+        len(rows),
+        len(columns),
+        len(strings.strings),
+        len(palette_ids),
+        strings_offset,
+        palette_offset,
+        grid_offset,
+        records_offset,
+    )
+
+    handle, temp_name = tempfile.mkstemp(dir=filename.parent, suffix=".pmap")
+    try:
+        with os.fdopen(handle, "wb") as pmap_file:
+            pmap_file.write(header)
+            pmap_file.write(string_bytes)
+            for ids in (palette_ids, row_ids, column_ids):
+                pmap_file.write(struct.pack(f"<{len(ids)}I", *ids))
+            pmap_file.write(records)
+        os.replace(temp_name, filename)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+
+class PmapPins(MutableMapping):  # pylint: disable=R0902
+    """The pins of a memory mapped .pmap file as a lazy {pin: {name:, color:}} mapping.
+
+    Opening the file only reads the header and the row/column labels.  A pin's record and its
+    strings are decoded the first time it is looked up and then kept so edits to the returned
+    dictionary stick.  Pins that are added or replaced are held in memory on top of the file.
+    """
+
+    def __init__(self, filename):
+        self.filename = Path(filename)
+        with open(self.filename, "rb") as pmap_file:
+            self._map = mmap.mmap(pmap_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header()
+        except BaseException:
+            self._map.close()  # A mapped file can't be removed or replaced on Windows.
+            raise
+        self._decoded: Dict[str, Optional[Dict]] = dict()
+        self._added: Dict[str, Dict] = dict()
+        self._removed: set = set()
+
+    def _read_header(self) -> None:  # pylint: disable=W0201
+        """Check the header and decode the row and column labels."""
+        if len(self._map) < HEADER.size:
+            raise PmapError(f"{self.filename} is too small to be a .pmap file")
+        (
+            magic,
+            version,
+            _,
+            self._pin_count,
+            row_count,
+            column_count,
+            self._string_count,
+            self._color_count,
+            self._strings_offset,
+            self._palette_offset,
+            grid_offset,
+            self._records_offset,
+        ) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise PmapError(f"{self.filename} is not a .pmap file")
+        if version != VERSION:
+            raise PmapError(f"{self.filename} is .pmap version {version}, expected {VERSION}")
+
+        self._blob_offset = self._strings_offset + UINT32.size * (self._string_count + 1)
+        self._strings: Dict[int, str] = dict()
+        self.rows = [
+            self.get_string(string_id)
+            for string_id in struct.unpack_from(f"<{row_count}I", self._map, grid_offset)
+        ]
+        self.columns = [
+            self.get_string(string_id)
+            for string_id in struct.unpack_from(
+                f"<{column_count}I", self._map, grid_offset + UINT32.size * row_count
+            )
+        ]
+        self._row_index = {row: index for index, row in enumerate(self.rows)}
+        self._column_index = {column: index for index, column in enumerate(self.columns)}
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._map.close()
+
+    def get_string(self, string_id: int) -> str:
+        """Decode an entry of the string table."""
+        try:
+            return self._strings[string_id]
+        except KeyError:
+            start, end = struct.unpack_from(
+                "<2I", self._map, self._strings_offset + UINT32.size * string_id
+            )
+            value = self._map[self._blob_offset + start : self._blob_offset + end].decode("utf-8")
+            self._strings[string_id] = value
+            return value
+
+    def get_color(self, color_index: int) -> str:
+        """Decode an entry of the color palette."""
+        (string_id,) = UINT32.unpack_from(
+            self._map, self._palette_offset + UINT32.size * color_index
+        )
+        return self.get_string(string_id)
+
+    def read_record(self, row: int, column: int) -> Optional[Tuple[str, Dict]]:
+        """Decode the pin at a row and column, None if there isn't one."""
+        offset = self._records_offset + (row * len(self.columns) + column) * RECORD.size
+        number_id, name_id, color_index = RECORD.unpack_from(self._map, offset)
+        if number_id == EMPTY:
+            return None
+        return (
+            self.get_string(number_id),
+            {"name": self.get_string(name_id), "color": self.get_color(color_index)},
+        )
+
+    def _lookup(self, number: str) -> Optional[Dict]:
+        """Find a pin in the file from its number."""
+        if number in self._decoded:
+            return self._decoded[number]
+        pin = None
+        row, column = split_pin(number)
+        if row in self._row_index and column in self._column_index:
+            record = self.read_record(self._row_index[row], self._column_index[column])
+            if record and record[0] == number:
+                pin = record[1]
+        self._decoded[number] = pin
+        return pin
+
+    def __getitem__(self, number: str) -> Dict:
+        number = str(number)
+        if number in self._added:
+            return self._added[number]
+        if number in self._removed:
+            raise KeyError(number)
+        pin = self._lookup(number)
+        if pin is None:
+            raise KeyError(number)
+        return pin
+
+    def __setitem__(self, number: str, pin: Dict) -> None:
+        number = str(number)
+        if number not in self._added and self._lookup(number) is not None:
+            self._removed.add(number)  # The in-memory pin now shadows the one in the file.
+        self._added[number] = pin
+
+    def __delitem__(self, number: str) -> None:
+        number = str(number)
+        if number in self._added:
+            del self._added[number]  # Any pin it shadowed in the file stays removed.
+            return
+        if number in self._removed or self._lookup(number) is None:
+            raise KeyError(number)
+        self._removed.add(number)
+
+    def __iter__(self) -> Iterator[str]:
+        for row in range(len(self.rows)):
+            for column in range(len(self.columns)):
+                record = self.read_record(row, column)
+                if record and record[0] not in self._removed:
+                    yield record[0]
+        for number in list(self._added):
+            yield number
+
+    def __len__(self) -> int:
+        return self._pin_count - len(self._removed) + len(self._added)
+
+    def __contains__(self, number) -> bool:
+        try:
+            self[number]
+        except KeyError:
+            return False
+        return True
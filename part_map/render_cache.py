@@ -0,0 +1,109 @@
+"""Skip exporting renders that would come out identical to the file already on disk.
+
+Each export is keyed by a hash of the part's pins and layout, the settings that change how it is
+drawn and the version of part_map.  The key and a hash of the file it produced are kept in a
+manifest in the same folder as the outputs, so running the same export again only has to hash
+the part to find out the existing file is still up to date.
+"""
+import hashlib
+import json
+import logging
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List
+
+MANIFEST_NAME = "part_map_manifest.json"
+
+RENDER_SETTINGS = ("circles", "labels", "rotate", "font_size", "box_size")
+
+
+@lru_cache(maxsize=None)
+def tool_version() -> str:
+    """Return the installed version of part_map."""
+    try:
+        from importlib.metadata import PackageNotFoundError, version  # pylint: disable=C0415
+    except ImportError:  # Python < 3.8
+        import pkg_resources  # pylint: disable=C0415
+
+        try:
+            return pkg_resources.get_distribution("part_map").version
+        except pkg_resources.DistributionNotFound:
+            return "unknown"
+    try:
+        return version("part_map")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def part_digest(part, columns: List = None, rows: List = None) -> str:
+    """Hash the pins of a part and the order its rows and columns are drawn in.
+
+    The columns and rows default to the part's own, pass others to hash the part as it will be
+    drawn after a rotation.
+    """
+    pins = {number: dict(pin) for number, pin in part.as_dict().items()}
+    columns = part.columns if columns is None else columns
+    rows = part.rows if rows is None else rows
+    content = {"pins": pins, "columns": list(columns), "rows": list(rows)}
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+def render_key(
+    part, settings: Dict, output_format: str, columns: List = None, rows: List = None
+) -> str:
+    """Return the cache key of rendering a part with the given settings to a format."""
+    content = {
+        "part": part_digest(part, columns, rows),
+        "settings": {name: settings.get(name) for name in RENDER_SETTINGS},
+        "format": output_format,
+        "version": tool_version(),
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+def file_digest(filename) -> str:
+    """Hash the contents of a file."""
+    digest = hashlib.sha256()
+    with open(filename, "rb") as output_file:
+        for block in iter(lambda: output_file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class RenderManifest:
+    """The render key and file hash of every export written to a folder."""
+
+    def __init__(self, folder):
+        self.log = logging.getLogger("partmap.render_cache")
+        self.filename = Path(folder).joinpath(MANIFEST_NAME)
+        self.entries: Dict[str, Dict] = dict()
+        if self.filename.exists():
+            try:
+                with open(self.filename) as manifest_file:
+                    self.entries = json.load(manifest_file)
+            except ValueError:
+                self.log.warning(f"Ignoring the corrupt render manifest {self.filename}")
+
+    def is_current(self, output, key: str) -> bool:
+        """Return True if the output exists and was rendered with this key."""
+        output = Path(output)
+        entry = self.entries.get(output.name)
+        if entry is None or entry["key"] != key or not output.exists():
+            return False
+        return entry["sha256"] == file_digest(output)  # Catch outputs changed by other tools.
+
+    def record(self, output, key: str) -> None:
+        """Remember the key an output was just rendered with."""
+        output = Path(output)
+        self.entries[output.name] = {"key": key, "sha256": file_digest(output)}
+        # Write next to the file and rename so it is never left half written.
+        temp_name = self.filename.with_name(f"{self.filename.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_name, "w") as manifest_file:
+                json.dump(self.entries, manifest_file, sort_keys=True, indent=4)
+            os.replace(temp_name, self.filename)
+        except BaseException:
+            if temp_name.exists():
+                temp_name.unlink()
+            raise
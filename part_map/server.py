@@ -0,0 +1,269 @@
+"""A long lived local HTTP server that renders parts on demand."""
+import copy
+import hashlib
+import json
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from typing import Any, Callable, Dict, Hashable, Optional
+from urllib.parse import parse_qs, urlparse
+
+from PySide2 import QtCore
+
+from .object import PartObject
+from .view import PartViewer
+
+CONTENT_TYPES = {"png": "image/png", "svg": "image/svg+xml", "json": "application/json"}
+
+DEFAULT_SETTINGS = {"refdes": "", "rotate": False, "circles": False, "labels": True, "margin": 5}
+
+
+class LRUCache:
+    """A thread safe cache that evicts the least recently used entry once it is full."""
+
+    def __init__(self, max_size: int = 64):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value and mark it as recently used, None if it isn't cached."""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache a value, evicting the oldest entry if the cache is full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+class RenderJob:
+    """A function call handed from a worker thread to the Qt thread and its eventual result."""
+
+    def __init__(self, function: Callable, *args):
+        self.function = function
+        self.args = args
+        self.result: Any = None
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+
+    def run(self) -> None:
+        """Call the function, capturing either its result or the exception it raised."""
+        try:
+            self.result = self.function(*self.args)
+        except Exception as error:  # pylint: disable=W0703
+            self.error = error
+        self.done.set()
+
+    def wait(self) -> Any:
+        """Block the calling thread until the job has run and return its result."""
+        self.done.wait()
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class RenderDispatcher(QtCore.QObject):
+    """Run render jobs on the Qt thread on behalf of the HTTP worker threads.
+
+    Qt only allows the scene to be painted from the thread that owns the QApplication so each
+    worker queues its job through a signal and waits.  Parsing and cache hits never touch Qt so
+    those requests are still served concurrently.
+    """
+
+    job_ready = QtCore.Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.job_ready.connect(self.run_job, QtCore.Qt.QueuedConnection)
+
+    def run_job(self, job: RenderJob) -> None:
+        """Run a job that was queued from a worker thread."""
+        job.run()
+
+    def call(self, function: Callable, *args) -> Any:
+        """Run the function on the Qt thread and return its result."""
+        job = RenderJob(function, *args)
+        if QtCore.QThread.currentThread() == self.thread():
+            job.run()
+        else:
+            self.job_ready.emit(job)
+        return job.wait()
+
+
+def render_part(part: PartObject, settings: Dict, image_format: str) -> bytes:
+    """Render a part as png or svg bytes using an offscreen PartViewer."""
+    # Rotating rearranges the part's rows and columns so give the view its own copy of them.
+    view_part = copy.copy(part)
+    view_part.columns = list(part.columns)
+    view_part.rows = list(part.rows)
+
+    viewer = PartViewer()
+    if settings.get("font_size"):
+        viewer.font_size = settings["font_size"]
+    viewer.setup(view_part, dict(settings))
+
+    buffer = QtCore.QBuffer()
+    buffer.open(QtCore.QBuffer.ReadWrite)
+    if image_format == "svg":
+        rendered = viewer.render_svg(buffer)
+    else:
+        image = viewer.render_image()
+        rendered = image is not None and image.save(buffer, "PNG")
+    viewer.deleteLater()
+    if not rendered:
+        raise ValueError("Nothing to create Image from.")
+    return buffer.data().data()  # bytes(QByteArray) crashes some PySide2 builds.
+
+
+class RenderServer(ThreadingMixIn, HTTPServer):
+    """Serve part renders, caching parsed parts and rendered outputs by content hash."""
+
+    daemon_threads = True
+
+    def __init__(self, address, dispatcher: Optional[RenderDispatcher], cache_size: int = 64):
+        super().__init__(address, RenderRequestHandler)
+        self.log = logging.getLogger("partmap.server")
+        self.dispatcher = dispatcher
+        self.parts = LRUCache(cache_size)
+        self.renders = LRUCache(cache_size)
+
+    def get_part(self, digest: str, filename: Path, content: bytes, refdes: str) -> PartObject:
+        """Return the parsed part for this content, parsing it only on a cache miss."""
+        key = (digest, filename.suffix, refdes)
+        part = self.parts.get(key)
+        if part is None:
+            with tempfile.TemporaryDirectory() as folder:
+                part_file = Path(folder).joinpath(filename.name)
+                part_file.write_bytes(content)
+                try:
+                    with PartObject.from_file(part_file, refdes) as loaded:
+                        # Read every pin before the upload is deleted, a .pmap part would
+                        # otherwise keep it mapped, and cache a part that holds no file open.
+                        part = PartObject(
+                            dict(loaded.as_dict()), filename, loaded.columns, loaded.rows
+                        )
+                except (KeyError, TypeError, ValueError) as error:
+                    # Name the client's file, not the temporary copy on this server.
+                    raise ValueError(str(error).replace(str(part_file), filename.name)) from error
+            self.parts.put(key, part)
+        return part
+
+    def get_output(self, filename: Path, content: bytes, settings: Dict, output: str) -> bytes:
+        """Return the requested output for a part, rendering it only on a cache miss."""
+        digest = hashlib.sha256(content).hexdigest()
+        key = (digest, filename.suffix, output, tuple(sorted(settings.items())))
+        result = self.renders.get(key)
+        if result is None:
+            part = self.get_part(digest, filename, content, settings["refdes"])
+            if output == "json":
+                result = json.dumps(part.as_dict(), sort_keys=True).encode("utf-8")
+            elif self.dispatcher is None:
+                raise ValueError("Rendering is not available on this server.")
+            else:
+                result = self.dispatcher.call(render_part, part, settings, output)
+            self.renders.put(key, result)
+        return result
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """Handle render requests for a part on disk (GET) or uploaded in the body (POST).
+
+    GET  /render?path=part.json&format=png
+    POST /render?filename=part.xlsx&format=svg  with the file contents as the request body
+
+    The render settings refdes, rotate, circles, labels and font_size are query parameters.
+    """
+
+    server: RenderServer
+
+    def do_GET(self) -> None:  # pylint: disable=C0103
+        """Render a part file that already exists on this machine."""
+        url = urlparse(self.path)
+        if url.path != "/render":
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        query = parse_qs(url.query)
+        if "path" not in query:
+            self.send_error(HTTPStatus.BAD_REQUEST, "Missing the path parameter.")
+            return
+        filename = Path(query["path"][0])
+        if not filename.is_file():
+            self.send_error(HTTPStatus.NOT_FOUND, f"{filename} does not exist.")
+            return
+        self.respond(filename, filename.read_bytes(), query)
+
+    def do_POST(self) -> None:  # pylint: disable=C0103
+        """Render a part file uploaded as the request body."""
+        url = urlparse(self.path)
+        if url.path != "/render":
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        query = parse_qs(url.query)
+        if "filename" not in query:
+            self.send_error(HTTPStatus.BAD_REQUEST, "Missing the filename parameter.")
+            return
+        content = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.respond(Path(Path(query["filename"][0]).name), content, query)
+
+    def respond(self, filename: Path, content: bytes, query: Dict) -> None:
+        """Send the requested output for the part back to the client."""
+        output = query.get("format", ["png"])[0].lower()
+        if output not in CONTENT_TYPES:
+            self.send_error(HTTPStatus.BAD_REQUEST, f"Unsupported format: {output}")
+            return
+        try:
+            settings = get_settings(query)
+            body = self.server.get_output(filename, content, settings, output)
+        except (KeyError, TypeError, ValueError) as error:
+            self.send_error(HTTPStatus.BAD_REQUEST, str(error))
+            return
+        except Exception:  # pylint: disable=W0703
+            self.server.log.exception(f"Failed to render {filename.name}")
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"Failed to render {filename.name}")
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", CONTENT_TYPES[output])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:  # pylint: disable=W0622
+        """Send the request log to the partmap logger instead of stderr."""
+        self.server.log.debug(f"{self.address_string()} - {format % args}")
+
+
+def get_settings(query: Dict) -> Dict:
+    """Build the render settings from the query parameters of a request."""
+    settings = dict(DEFAULT_SETTINGS)
+    for key, value in query.items():
+        if key in ["rotate", "circles", "labels"]:
+            settings[key] = value[0].lower() in ["1", "true", "yes", "on"]
+        elif key == "refdes":
+            settings[key] = value[0]
+        elif key == "font_size":
+            settings[key] = int(value[0])
+    return settings
+
+
+def start_server(host: str, port: int, cache_size: int = 64) -> RenderServer:
+    """Start serving in a background thread, rendering on the calling (Qt) thread."""
+    server = RenderServer((host, port), RenderDispatcher(), cache_size)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.log.info(f"Serving part renders on http://{host}:{server.server_address[1]}/render")
+    return server
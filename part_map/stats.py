@@ -0,0 +1,139 @@
+"""Statistics about the nets of a part that are kept up to date as pins change."""
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .pmap import split_pin
+
+GROUND = "ground"
+POWER = "power"
+SIGNAL = "signal"
+
+# Rails are matched at the start of any _ separated word so USB_GND and VCCO_34 both count.
+GROUND_NET = re.compile(r"(^|_)(A|D|P|S)?(GND|VSS)", re.IGNORECASE)
+POWER_NET = re.compile(
+    r"(^|_)((A|D|MGTA?)?(VCC|VDD|VPP|VIN|VBAT|VTT|PWR)|\+?\d+V\d*(_|$)|P\d+V\d*)", re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=4096)
+def classify_net(name) -> str:
+    """Return whether a net is ground, power or a signal from its name."""
+    name = "" if name is None else str(name)
+    if GROUND_NET.search(name):
+        return GROUND
+    if POWER_NET.search(name):
+        return POWER
+    return SIGNAL
+
+
+class PartStatistics:
+    """Per net pin counts, power/ground ratios and ground density for a part.
+
+    Every aggregate is a counter so adding, removing or renaming a pin is O(1) regardless of the
+    size of the part.  Regions are square tiles of region_size rows by region_size columns.
+    """
+
+    def __init__(self, rows: List, columns: List, region_size: int = 8):
+        self.region_size = region_size
+        self.rows = [str(row) for row in rows]
+        self.columns = [str(column) for column in columns]
+        self._row_index = {row: index for index, row in enumerate(self.rows)}
+        self._column_index = {column: index for index, column in enumerate(self.columns)}
+
+        self.pin_count = 0
+        self.net_counts: Counter = Counter()
+        self.kind_counts: Counter = Counter()
+        self.region_pins: Counter = Counter()
+        self.region_ground: Counter = Counter()
+
+    def get_region(self, number) -> Optional[Tuple[int, int]]:
+        """Return the (row, column) tile a pin falls in or None if it is outside the grid."""
+        row, column = split_pin(str(number))
+        if row not in self._row_index or column not in self._column_index:
+            return None
+        return (
+            self._row_index[row] // self.region_size,
+            self._column_index[column] // self.region_size,
+        )
+
+    def add(self, number, name) -> None:
+        """Count a new pin."""
+        kind = classify_net(name)
+        self.pin_count += 1
+        self.net_counts[name] += 1
+        self.kind_counts[kind] += 1
+        region = self.get_region(number)
+        if region is not None:
+            self.region_pins[region] += 1
+            if kind == GROUND:
+                self.region_ground[region] += 1
+
+    def remove(self, number, name) -> None:
+        """Stop counting a pin that was removed or is about to be replaced."""
+        kind = classify_net(name)
+        self.pin_count -= 1
+        self.net_counts[name] -= 1
+        if not self.net_counts[name]:
+            del self.net_counts[name]
+        self.kind_counts[kind] -= 1
+        region = self.get_region(number)
+        if region is not None:
+            self.region_pins[region] -= 1
+            if kind == GROUND:
+                self.region_ground[region] -= 1
+
+    def rename(self, number, old_name, new_name) -> None:
+        """Move a pin from one net to another."""
+        self.remove(number, old_name)
+        self.add(number, new_name)
+
+    def ratio(self, kind: str) -> float:
+        """Return the fraction of the pins that are of the given kind."""
+        if not self.pin_count:
+            return 0.0
+        return self.kind_counts[kind] / self.pin_count
+
+    def region_name(self, region: Tuple[int, int]) -> str:
+        """Name a region by its first and last pin, i.e. A1-H8."""
+        first_row = region[0] * self.region_size
+        first_column = region[1] * self.region_size
+        last_row = min(first_row + self.region_size, len(self.rows)) - 1
+        last_column = min(first_column + self.region_size, len(self.columns)) - 1
+        return (
+            f"{self.rows[first_row]}{self.columns[first_column]}-"
+            f"{self.rows[last_row]}{self.columns[last_column]}"
+        )
+
+    def region_density(self) -> Dict[str, Dict]:
+        """Return the pin count, ground count and ground density of each region."""
+        density = dict()
+        for region in sorted(self.region_pins):
+            pins = self.region_pins[region]
+            if not pins:
+                continue
+            ground = self.region_ground[region]
+            density[self.region_name(region)] = {
+                "pins": pins,
+                "ground": ground,
+                "ground_density": ground / pins,
+            }
+        return density
+
+    def summary(self) -> Dict:
+        """Return all of the statistics as a json serializable dictionary."""
+        signal = self.kind_counts[SIGNAL]
+        ground = self.kind_counts[GROUND]
+        return {
+            "pins": self.pin_count,
+            "power": self.kind_counts[POWER],
+            "ground": ground,
+            "signal": signal,
+            "power_ratio": self.ratio(POWER),
+            "ground_ratio": self.ratio(GROUND),
+            "signal_to_ground": signal / ground if ground else None,
+            "nets": {str(name): count for name, count in self.net_counts.most_common()},
+            "region_size": self.region_size,
+            "regions": self.region_density(),
+        }
@@ -0,0 +1,40 @@
+"""Widget summarizing the nets of the loaded part."""
+from PySide2 import QtCore, QtWidgets
+
+from part_map.stats import PartStatistics
+
+
+class SummaryWidget(QtWidgets.QWidget):
+    """Show the pin counts of each net and the power/ground balance of the part."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.totals = QtWidgets.QLabel()
+        self.nets = QtWidgets.QTableWidget(0, 2)
+        self.nets.setHorizontalHeaderLabels(["Net", "Pins"])
+        self.nets.horizontalHeader().setStretchLastSection(True)
+        self.nets.verticalHeader().setVisible(False)
+        self.nets.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+
+        layout = QtWidgets.QVBoxLayout()
+        layout.addWidget(self.totals)
+        layout.addWidget(self.nets)
+        self.setLayout(layout)
+
+    def update_statistics(self, statistics: PartStatistics) -> None:
+        """Refresh the widget, which costs one row per net rather than one per pin."""
+        summary = statistics.summary()
+        self.totals.setText(
+            f"Pins: {summary['pins']}\n"
+            f"Power: {summary['power']} ({summary['power_ratio']:.1%})\n"
+            f"Ground: {summary['ground']} ({summary['ground_ratio']:.1%})\n"
+            f"Signal: {summary['signal']}"
+        )
+        self.nets.setSortingEnabled(False)
+        self.nets.setRowCount(len(summary["nets"]))
+        for row, (name, count) in enumerate(summary["nets"].items()):
+            count_item = QtWidgets.QTableWidgetItem()
+            count_item.setData(QtCore.Qt.DisplayRole, count)
+            self.nets.setItem(row, 0, QtWidgets.QTableWidgetItem(name))
+            self.nets.setItem(row, 1, count_item)
+        self.nets.setSortingEnabled(True)
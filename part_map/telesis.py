@@ -0,0 +1,120 @@
+"""Parse Telesis netlists in parallel by splitting them into line aligned byte ranges.
+
+A net starts on a line containing ``NET_NAME;`` and continues onto the following lines for as
+long as each line ends with a comma::
+
+    GND; U1.A1 U1.B2 U2.1 ,
+         U1.C3 U1.D4
+    VCC; U1.A2
+
+Each worker parses its own range of the file.  Lines at the start of a range may continue a net
+from the previous range, so a worker returns those pins separately along with the state of the
+net that was open at the end of its range.  The ranges are then merged in file order, which keeps
+the result identical to parsing the whole file in one pass.
+"""
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Below this many bytes per worker the cost of starting processes outweighs the parse.
+MIN_CHUNK_SIZE = 8 * 1024 * 1024
+
+DEFAULT_COLOR = "#ffffff"
+
+
+class RangeResult(NamedTuple):
+    """The pins found in one byte range of a netlist."""
+
+    leading: List[str]  # Pins on lines that continue the net open at the end of the last range.
+    pins: List[Tuple[str, str]]  # (pin, net) in the order they appear.
+    net: Optional[str]  # The net open at the end of the range, None if it was inherited.
+    inherits: bool  # The range never started a net of its own.
+    continues: bool  # The last line ended with a comma.
+
+
+def split_ranges(filename, workers: int, min_chunk_size: int = MIN_CHUNK_SIZE) -> List[Tuple]:
+    """Split a file into at most workers (start, end) byte ranges that begin on a new line."""
+    size = os.path.getsize(filename)
+    count = max(1, min(workers, size // max(1, min_chunk_size)))
+    boundaries = [0]
+    with open(filename, "rb") as net_file:
+        for index in range(1, count):
+            net_file.seek(size * index // count)
+            net_file.readline()  # Finish the line we landed in so the range starts on a new one.
+            position = net_file.tell()
+            if boundaries[-1] < position < size:
+                boundaries.append(position)
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def parse_range(filename, refdes: str, start: int, end: int) -> RangeResult:
+    """Parse the lines of a netlist between two byte offsets."""
+    net_pattern = re.compile(rb"(.*);")
+    pin_pattern = re.compile(refdes.encode("utf-8") + rb"\.([a-zA-Z0-9]+)")
+    marker = refdes.encode("utf-8") + b"."
+
+    leading: List[str] = list()
+    pins: List[Tuple[str, str]] = list()
+    net = None
+    inherits = True
+    continues = start > 0  # Assume the first line may continue a net until proven otherwise.
+
+    with open(filename, "rb") as net_file:
+        net_file.seek(start)
+        position = start
+        for line in net_file:
+            if position >= end:
+                break
+            position += len(line)
+            # Most lines of a whole board netlist don't mention the refdes, skip the regex.
+            found = pin_pattern.findall(line) if marker in line else []
+
+            match = net_pattern.match(line) if b";" in line else None
+            if match:
+                net = match.group(1).decode("utf-8", errors="replace")
+                inherits = False
+                pins.extend((pin.decode("ascii"), net) for pin in found)
+            elif continues and inherits:
+                leading.extend(pin.decode("ascii") for pin in found)
+            elif continues and net is not None:
+                pins.extend((pin.decode("ascii"), net) for pin in found)
+            else:
+                net = None
+                inherits = False
+            continues = line.rstrip().endswith(b",")
+    return RangeResult(leading, pins, net, inherits, continues)
+
+
+def merge_ranges(results: List[RangeResult]) -> Dict:
+    """Merge the parsed ranges in file order into a {pin: {name:, color:}} dictionary."""
+    netlist: Dict = dict()
+    open_net = None
+    for result in results:
+        if open_net is not None:
+            for pin in result.leading:
+                netlist.update({pin: {"name": open_net, "color": DEFAULT_COLOR}})
+        for pin, net in result.pins:
+            netlist.update({pin: {"name": net, "color": DEFAULT_COLOR}})
+        if not result.inherits:
+            open_net = result.net
+        if not result.continues:
+            open_net = None
+    return netlist
+
+
+def parse_telesis(
+    filename, refdes: str, workers: Optional[int] = None, min_chunk_size: int = MIN_CHUNK_SIZE
+) -> Dict:
+    """Parse the pins of a refdes out of a Telesis netlist using up to workers processes."""
+    workers = workers or os.cpu_count() or 1
+    ranges = split_ranges(filename, workers, min_chunk_size)
+    if len(ranges) == 1:
+        return merge_ranges([parse_range(filename, refdes, *ranges[0])])
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        futures = [
+            executor.submit(parse_range, str(filename), refdes, start, end)
+            for start, end in ranges
+        ]
+        return merge_ranges([future.result() for future in futures])
@@ -1,15 +1,47 @@
 """ Visual pin out of a BGA or connector """
 import logging
-from typing import List
+import math
+from typing import Dict, Iterable, List, Sequence, Union
 
-from PySide2 import QtCore, QtGui, QtWidgets
+from PySide2 import QtCore, QtGui, QtSvg, QtWidgets
 
+from part_map.history import EditHistory, PinEdit
 from part_map.pins import Pin
+from part_map.pins.bulk import expand_names
+from part_map.render_cache import RenderManifest, render_key
+
+BOX_SIZE = 50
+FONT_SIZE = 12
+
+
+def fit_box_size(box_size: int, columns: int) -> int:
+    """Scale the box size up so a part narrower than 1536 (2K width) fills that width."""
+    part_width = (columns + 1) * box_size
+    if part_width < 1536.0:
+        return int(box_size * 1536.0 / part_width)
+    return box_size
+
+
+def export_key(part, settings: Dict) -> str:
+    """Return the key a new PartViewer set up with the part and settings saves its image with.
+
+    Rotation and box scaling are worked out the way setup does them but nothing is drawn, so a
+    caller can find out the saved image is up to date without building a view at all.
+    """
+    columns, rows = list(part.columns), list(part.rows)
+    if settings.get("rotate"):
+        columns, rows = rows, columns[::-1]  # As rotate_drawing does.
+    render = {name: settings.get(name) for name in ("circles", "labels", "rotate")}
+    render.update({"font_size": FONT_SIZE, "box_size": fit_box_size(BOX_SIZE, len(columns))})
+    return render_key(part, render, "png", columns, rows)
 
 
 class PartViewer(QtWidgets.QGraphicsView):
     """ Create a render of the part and load it into a QWidget """
 
+    pin_edited = QtCore.Signal(list)  # The numbers of the pins that changed.
+    rendered = QtCore.Signal()  # The look of the whole part changed.
+
     # pylint: disable=R0902
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -17,9 +49,11 @@ class PartViewer(QtWidgets.QGraphicsView):
 
         self.settings = None
         self.part = None
+        self.pin_items = dict()
+        self.history = EditHistory()
 
-        self.box_size = 50
-        self.font_size = 12
+        self.box_size = BOX_SIZE
+        self.font_size = FONT_SIZE
         self.zoom_level = 0
 
         self.scene = QtWidgets.QGraphicsScene()
@@ -39,6 +73,7 @@ class PartViewer(QtWidgets.QGraphicsView):
         """Return the settings dictionary."""
         self.part = part
         self.settings = settings
+        self.history.clear()
         if self.settings["rotate"]:
             self.rotate_drawing()
         self.scale_box_size(self.part.columns, self.part.rows)
@@ -48,8 +83,10 @@ class PartViewer(QtWidgets.QGraphicsView):
     def generate_render(self) -> None:
         """ Generate the part """
         self.scene.clear()
+        self.pin_items = dict()
         part_cols = self.part.columns
         part_rows = self.part.rows
+        self.configure_index(len(part_cols), len(part_rows))
 
         # Draw the Header Row
         for hdr_offset, column in enumerate(part_cols):
@@ -60,10 +97,10 @@ class PartViewer(QtWidgets.QGraphicsView):
         # Draw the Part
         for y_offset, row in enumerate(part_rows):
             for x_offset, column in enumerate(part_cols):
-                pin = self.part.get_pin(str(row), str(column))
-                if pin:
+                number = self.part.get_pin_number(str(row), str(column))
+                if number is not None:
                     pin_graphic = Pin(
-                        pin,
+                        self.part.get_pin(number, ""),
                         QtCore.QRectF(
                             self.box_size * x_offset + int(self.box_size / 2),
                             self.box_size * y_offset + self.box_size,
@@ -72,55 +109,209 @@ class PartViewer(QtWidgets.QGraphicsView):
                         ),
                         show_label=self.settings["labels"],
                         view=self,
+                        number=number,
                     )
+                    self.pin_items[number] = pin_graphic
                     self.scene.addItem(pin_graphic)
-                    pin_graphic.clicked.connect(
-                        self.parentWidget().parentWidget().set_properties_widget
-                    )
-                text = self.scene.addText(row, QtGui.QFont("Arial", self.font_size))
-                text.setDefaultTextColor(QtCore.Qt.black)
-                text.setPos(
-                    self.box_size * len(part_cols) + int(self.box_size),
-                    self.box_size * y_offset + self.box_size + int(self.box_size / 2),
-                )
+                    if hasattr(self.window(), "set_properties_widget"):
+                        pin_graphic.clicked.connect(self.window().set_properties_widget)
+            text = self.scene.addText(row, QtGui.QFont("Arial", self.font_size))
+            text.setDefaultTextColor(QtCore.Qt.black)
+            text.setPos(
+                self.box_size * len(part_cols) + int(self.box_size),
+                self.box_size * y_offset + self.box_size + int(self.box_size / 2),
+            )
         self.scene.update()
+        self.rendered.emit()
+
+    def configure_index(self, columns: int, rows: int) -> None:
+        """Tune the scene index for a static grid of columns x rows pins.
+
+        The scene rect is fixed up front so adding items never grows it, which would otherwise
+        throw away and rebuild the index, and the BSP tree depth is set so each leaf holds a
+        handful of items instead of Qt guessing from the item count on the first lookup.
+        """
+        rect = self.grid_rect(columns, rows)
+        self.scene.setSceneRect(rect)
+        items = columns * rows + columns + rows  # Pins, column headers and row labels.
+        self.scene.setItemIndexMethod(QtWidgets.QGraphicsScene.BspTreeIndex)
+        self.scene.setBspTreeDepth(max(4, min(12, math.ceil(math.log2(max(items, 1) / 4)))))
+
+    def grid_rect(self, columns: int = None, rows: int = None) -> QtCore.QRectF:
+        """Return the area the part covers in the scene, computed from the grid geometry."""
+        if columns is None or rows is None:
+            columns, rows = len(self.part.columns), len(self.part.rows)
+        return QtCore.QRectF(0, 0, (columns + 2) * self.box_size, (rows + 2) * self.box_size)
+
+    def edit_pin(self, number: str, name: str = None, color: str = None) -> None:
+        """Change the name and/or color of a pin and redraw it."""
+        self.edit_pins({number: {"name": name, "color": color}})
+
+    def edit_pins(self, changes: Dict[str, Dict]) -> None:
+        """Change the names and/or colors of many pins as a single step of the undo history.
+
+        changes maps pin numbers to {name:, color:} where a missing or None field is left as is.
+        """
+        edits = list()
+        pins = self.part.as_dict()
+        for number, fields in changes.items():
+            pin = pins[number]
+            for field in ("name", "color"):
+                if fields.get(field) is not None:
+                    edits.append(PinEdit(number, field, pin[field], fields[field]))
+        self.history.record(edits)
+        self.apply_edits(edits)
+
+    def undo(self) -> None:
+        """Revert the last edit."""
+        self.apply_edits(self.history.undo())
+
+    def redo(self) -> None:
+        """Apply the last edit that was undone again."""
+        self.apply_edits(self.history.redo())
+
+    def apply_edits(self, edits: Sequence[PinEdit]) -> None:
+        """Write edits to the part and redraw the pins they touched."""
+        numbers = dict()  # Keeps the order the pins were edited in without repeats.
+        for edit in edits:
+            if edit.field == "name":
+                self.part.set_pin_name(edit.number, edit.new)
+            else:
+                self.part.set_pin_color(edit.number, edit.new)
+            numbers[edit.number] = None
+        if not numbers:
+            return
+        # One scene update for the whole edit, not one per pin.  The view repaints its whole
+        # viewport on any update so a tighter rect than the pin or the scene buys nothing.
+        if len(numbers) == 1 and next(iter(numbers)) in self.pin_items:
+            self.scene.update(self.pin_items[next(iter(numbers))].rect)
+        else:
+            self.scene.update()
+        self.pin_edited.emit(list(numbers))
+
+    def edit_selected(
+        self, numbers: List[str] = None, name: str = None, color: str = None
+    ) -> None:
+        """Give pins, the selected ones by default, a name pattern and/or color as one edit.
+
+        The name may be a pattern, see expand_names.  Every name is expanded before any pin is
+        changed so an invalid pattern raises ValueError without editing anything.
+        """
+        if numbers is None:
+            numbers = self.selected_numbers()
+        names = [None] * len(numbers)
+        if name is not None:
+            pins = self.part.as_dict()
+            names = expand_names(name, [(number, pins[number]["name"]) for number in numbers])
+        self.edit_pins(
+            {
+                number: {"name": names[index], "color": color}
+                for index, number in enumerate(numbers)
+            }
+        )
 
-    def save(self) -> None:
-        """ Save the Pixmap as a .png """
+    def set_select_mode(self, enabled: bool) -> None:
+        """Drag a rubber band to select pins instead of scrolling the view."""
+        self.setDragMode(self.RubberBandDrag if enabled else self.ScrollHandDrag)
+        # A pin fills its bounding rect so skip asking each one for its shape.
+        self.setRubberBandSelectionMode(QtCore.Qt.IntersectsItemBoundingRect)
+
+    def selected_numbers(self) -> List[str]:
+        """Return the numbers of the selected pins in the order they are drawn, row by row."""
+        selected = {item.number for item in self.scene.selectedItems() if isinstance(item, Pin)}
+        return [number for number in self.pin_items if number in selected]
+
+    def select_pins(self, numbers: Iterable[str]) -> None:
+        """Select exactly these pins, with a single selectionChanged for the whole change."""
+        self.scene.blockSignals(True)
+        try:
+            self.scene.clearSelection()
+            for number in numbers:
+                if number in self.pin_items:
+                    self.pin_items[number].setSelected(True)
+        finally:
+            self.scene.blockSignals(False)
+        self.scene.selectionChanged.emit()
+
+    def select_net(self, names: Iterable[str] = None) -> List[str]:
+        """Select every pin on the given nets, or on the nets of the selected pins."""
+        if names is None:
+            names = {self.part.get_pin(number, "")["name"] for number in self.selected_numbers()}
+        names = set(names)
+        numbers = [number for number, pin in self.part.as_dict().items() if pin["name"] in names]
+        self.select_pins(numbers)
+        return numbers
+
+    def save(self, force: bool = False) -> None:
+        """ Save the Pixmap as a .png unless the last one saved is still up to date """
+        save_file = self.settings["filename"].with_suffix(".png")
+        manifest = RenderManifest(save_file.parent)
+        key = render_key(self.part, self.render_settings(), "png")
+        if not force and manifest.is_current(save_file, key):
+            self.log.info(f"{save_file} is up to date")
+            return
+        image = self.render_image()
+        if image is None:
+            self.log.error("Nothing to create Image from.")
+        elif not image.save(str(save_file)):
+            self.log.error(f"Failed to save image to {save_file}")
+        else:
+            self.log.info(f"Saved image to {save_file}")
+            manifest.record(save_file, key)
+
+    def render_settings(self) -> Dict:
+        """Return everything besides the part that changes how it is drawn."""
+        settings = {name: self.settings.get(name) for name in ("circles", "labels", "rotate")}
+        settings.update({"font_size": self.font_size, "box_size": self.box_size})
+        return settings
+
+    def render_image(self) -> Union[QtGui.QImage, None]:
+        """Render the scene into an image or None if the scene is empty."""
         rect = self.scene.itemsBoundingRect()
-        if not rect.isEmpty():  # Only create a screen shot if there is something on it.
-            self.scene.setSceneRect(rect)
+        if rect.isEmpty():  # Only create a screen shot if there is something on it.
+            return None
+        self.scene.setSceneRect(rect)
 
-            image = QtGui.QImage(
-                self.scene.sceneRect().width(),
-                self.scene.sceneRect().height(),
-                QtGui.QImage.Format_RGB32,
-            )
-            image.fill(QtCore.Qt.transparent)
-
-            painter = QtGui.QPainter(image)
-            painter.setRenderHints(
-                QtGui.QPainter.HighQualityAntialiasing
-                | QtGui.QPainter.SmoothPixmapTransform
-                | QtGui.QPainter.TextAntialiasing,
-                True,
-            )
+        image = QtGui.QImage(
+            self.scene.sceneRect().width(),
+            self.scene.sceneRect().height(),
+            QtGui.QImage.Format_RGB32,
+        )
+        image.fill(QtCore.Qt.transparent)
+
+        painter = QtGui.QPainter(image)
+        try:
+            # One hint at a time, some PySide2 builds can't pass a combination of them.
+            painter.setRenderHint(QtGui.QPainter.HighQualityAntialiasing, True)
+            painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform, True)
+            painter.setRenderHint(QtGui.QPainter.TextAntialiasing, True)
+            self.scene.render(painter)
+        finally:
+            painter.end()  # A device that is still being painted can't be destroyed.
+        return image
+
+    def render_svg(self, device: QtCore.QIODevice) -> bool:
+        """Render the scene as an SVG into the device, returning False if the scene is empty."""
+        rect = self.scene.itemsBoundingRect()
+        if rect.isEmpty():
+            return False
+        self.scene.setSceneRect(rect)
+
+        generator = QtSvg.QSvgGenerator()
+        generator.setOutputDevice(device)
+        generator.setSize(rect.size().toSize())
+        generator.setViewBox(QtCore.QRectF(0, 0, rect.width(), rect.height()))
+
+        painter = QtGui.QPainter(generator)
+        try:
             self.scene.render(painter)
+        finally:
             painter.end()
-            save_file = self.settings["filename"].with_suffix(".png")
-            self.log.info(f"Saved image to {save_file}")
-            image.save(str(save_file))
-        else:
-            self.log.error("Nothing to create Image from.")
+        return True
 
     def scale_box_size(self, columns: List, rows: List) -> None:
         """If the part width is less than 1536 (2K width) scale up."""
-        part_width = (len(columns) + 1) * self.box_size
-        if part_width < 1536.0:
-            window_scale = 1536.0 / part_width
-        else:
-            window_scale = 1
-        self.box_size = int(self.box_size * window_scale)
+        self.box_size = fit_box_size(self.box_size, len(columns))
         self.settings["image_width"] = (len(columns) + 1) * self.box_size + self.box_size
         self.settings["image_height"] = (len(rows) + 1) * self.box_size + self.box_size
         self.setSceneRect(0, 0, self.settings["image_width"], self.settings["image_height"])
@@ -133,6 +324,7 @@ class PartViewer(QtWidgets.QGraphicsView):
         else:
             self.settings["circles"] = True
         self.scene.update()
+        self.rendered.emit()
 
     def toggle_labels(self):
         """Change between labels on or off."""
@@ -141,6 +333,7 @@ class PartViewer(QtWidgets.QGraphicsView):
         else:
             self.settings["labels"] = True
         self.scene.update()
+        self.rendered.emit()
 
     def rotate_drawing(self):
         """Rotate the diagram."""
@@ -199,8 +392,6 @@ class PartViewer(QtWidgets.QGraphicsView):
         self.generate_render()
 
     def fit_view(self):
-        """Update the view rect to cover anything in the scene."""
-        rect = QtCore.QRectF()
-        for item in self.scene.items():
-            rect = rect.united(item.boundingRect())
-        self.fitInView(rect, QtCore.Qt.KeepAspectRatio)
+        """Update the view rect to cover the whole part."""
+        if self.part:
+            self.fitInView(self.grid_rect(), QtCore.Qt.KeepAspectRatio)
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--regression",
+        action="store_true",
+        help="Compare renders against the golden images and timings in tests/golden.",
+    )
+    parser.addoption(
+        "--update-golden",
+        action="store_true",
+        help="Store the renders and timings of this run as the new golden images and baseline.",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "regression: golden image and timing regression tests")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--regression") or config.getoption("--update-golden"):
+        return
+    skip = pytest.mark.skip(reason="needs --regression")
+    for item in items:
+        if "regression" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,119 @@
+import json
+import os
+
+import pytest
+from PySide2 import QtWidgets
+
+from part_map.autosave import AutoSaver, Journal
+from part_map.object import PartObject
+from part_map.view import PartViewer
+
+PINS = {"A1": {"name": "GND", "color": "#ffffff"}, "A2": {"name": "VCC", "color": "#ffffff"}}
+
+
+def test_journal_replay(tmp_path):
+    filename = tmp_path.joinpath("part.json")
+    filename.write_text(json.dumps(PINS))
+    journal = Journal(filename)
+    journal.append({"A1": {"name": "SIG", "color": "#ffffff"}})
+    journal.append(
+        {"A1": {"name": "SIG", "color": "#ff0000"}, "B1": {"name": "NEW", "color": "#ffffff"}}
+    )
+    with open(journal.filename, "a") as journal_file:
+        journal_file.write('{"pin": "A2", "na')  # Cut short by a crash.
+
+    part = PartObject.from_json(filename)
+    assert journal.replay(part) == 2
+    assert part.get_pin("A1", "") == {"name": "SIG", "color": "#ff0000"}
+    assert part.get_pin("B1", "") == {"name": "NEW", "color": "#ffffff"}
+    assert part.get_pin("A2", "") == PINS["A2"]
+
+
+def test_journal_compact(tmp_path):
+    filename = tmp_path.joinpath("part.json")
+    journal = Journal(filename)
+    journal.append({"A1": {"name": "SIG", "color": "#ffffff"}})
+    journal.compact(PINS)
+    assert not journal.exists()
+    assert json.loads(filename.read_text()) == PINS
+    assert list(tmp_path.iterdir()) == [filename]
+
+
+def test_journal_per_source(tmp_path):
+    json_journal = Journal(tmp_path.joinpath("part.json"))
+    excel_journal = Journal(tmp_path.joinpath("part.xlsx"))
+    assert json_journal.filename.name == "part.json.journal"
+    assert excel_journal.filename.name == "part.xlsx.journal"
+    assert not excel_journal.can_compact()
+    excel_journal.append({"A1": {"name": "SIG", "color": "#ffffff"}})
+    assert not json_journal.exists()
+    with pytest.raises(ValueError):
+        excel_journal.compact(PINS)
+    assert excel_journal.exists()
+    assert not tmp_path.joinpath("part.json").exists()
+
+
+def test_autosave_only_journals_other_formats(tmp_path):
+    _ = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    tmp_path.joinpath("part.json").write_text("unrelated")
+    part = PartObject({number: dict(pin) for number, pin in PINS.items()}, tmp_path / "part.xlsx")
+    saver = AutoSaver(PartViewer())
+    saver.start(part)
+    part.set_pin_name("A1", "SIG")
+    saver.queue(["A1"])
+    saver.close()
+    assert tmp_path.joinpath("part.json").read_text() == "unrelated"
+    assert Journal.for_part(part).read() == {"A1": {"name": "SIG", "color": "#ffffff"}}
+
+    reopened = PartObject({number: dict(pin) for number, pin in PINS.items()}, part.filename)
+    saver = AutoSaver(PartViewer())
+    assert saver.start(reopened) == 1
+    assert reopened.get_pin("A1", "")["name"] == "SIG"
+    saver.close()
+    assert tmp_path.joinpath("part.json").read_text() == "unrelated"
+
+
+def create_saver(tmp_path, suffix=".xlsx"):
+    _ = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    filename = tmp_path.joinpath(f"part{suffix}")
+    filename.write_text("source")
+    part = PartObject({number: dict(pin) for number, pin in PINS.items()}, filename)
+    return AutoSaver(PartViewer()), part
+
+
+def test_autosave_saved_clears_journal(tmp_path):
+    saver, part = create_saver(tmp_path)
+    saver.start(part)
+    part.set_pin_name("A1", "SIG")
+    saver.queue(["A1"])
+    saver.flush().result()
+    assert Journal.for_part(part).exists()
+    part.set_pin_name("A2", "SIG")
+    saver.queue(["A2"])
+    saver.saved().result()
+    assert not Journal.for_part(part).exists()
+    saver.close()
+    assert not Journal.for_part(part).exists()
+
+
+def test_autosave_stale_journal(tmp_path):
+    saver, part = create_saver(tmp_path)
+    journal = Journal.for_part(part)
+    journal.append({"A1": {"name": "SIG", "color": "#ffffff"}})
+    stat = journal.filename.stat()
+    os.utime(part.filename, (stat.st_atime + 10, stat.st_mtime + 10))  # Changed since.
+    assert journal.is_stale()
+
+    asked = list()
+    assert saver.start(part, lambda stale: asked.append(stale) or True) == 1
+    assert asked[0].filename == journal.filename
+    assert part.get_pin("A1", "")["name"] == "SIG"
+    saver.close()
+
+    saver, part = create_saver(tmp_path)
+    os.utime(part.filename, (stat.st_atime + 10, stat.st_mtime + 10))
+    assert saver.start(part) == 0  # Nobody to ask.
+    assert part.get_pin("A1", "")["name"] == "GND"
+    assert not journal.exists()
+    assert journal.filename.with_name("part.xlsx.journal.old").exists()
+    saver.close()
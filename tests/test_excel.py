@@ -0,0 +1,76 @@
+import shutil
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook
+from openpyxl.styles import PatternFill
+from openpyxl.styles.colors import Color
+
+from part_map.excel import apply_tint
+from part_map.part_map import PartObject
+
+
+def write_workbook(path, fills):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Number", "Name"])
+    for row, (pin, color) in enumerate(fills, start=2):
+        sheet.append([pin, f"NET_{pin}"])
+        if color is not None:
+            sheet.cell(row=row, column=2).fill = PatternFill("solid", fgColor=color)
+    workbook.save(path)
+
+
+def test_excel_colors(tmp_path):
+    filename = tmp_path.joinpath("colors.xlsx")
+    write_workbook(
+        filename,
+        [
+            ("A1", Color(rgb="FF123456")),
+            ("A2", Color(indexed=2)),
+            ("A3", Color(theme=4)),
+            ("A4", Color(theme=1, tint=0.5)),
+            ("A5", None),
+        ],
+    )
+    obj = PartObject.from_excel(filename)
+    assert obj.get_pin("A", "1")["color"] == "#123456"
+    assert obj.get_pin("A", "2")["color"] == "#FF0000"
+    assert obj.get_pin("A", "3")["color"] == "#4F81BD"
+    assert obj.get_pin("A", "4")["color"] == "#808080"
+    assert obj.get_pin("A", "5")["color"] == "#ffffff"
+
+
+def test_apply_tint():
+    assert apply_tint("000000", 0) == "000000"
+    assert apply_tint("FFFFFF", -0.5) == "808080"
+    assert apply_tint("000000", 1.0) == "FFFFFF"
+
+
+def test_excel_round_trip(tmp_path):
+    obj = PartObject.from_json(
+        Path(__file__).parent.parent.joinpath("examples", "connector_example.json")
+    )
+    filename = tmp_path.joinpath("round_trip.xlsx")
+    obj.dump_excel(filename)
+    loaded = PartObject.from_excel(filename)
+    assert loaded.get_number_of_pins() == obj.get_number_of_pins()
+    for number in obj.pins:
+        original = obj.get_pin(number, "")
+        pin = loaded.get_pin(number, "")
+        assert pin["name"] == original["name"]
+        assert pin["color"].lower() == original["color"].lower()
+
+
+def test_excel_export_keeps_source(tmp_path):
+    source = tmp_path.joinpath("artix7_example.xlsx")
+    shutil.copy(Path(__file__).parent.parent.joinpath("examples", source.name), source)
+    original = source.read_bytes()
+    obj = PartObject.from_excel(source)
+    obj.dump_excel()
+    assert source.read_bytes() == original
+    exported = PartObject.from_excel(tmp_path.joinpath("artix7_example_pinout.xlsx"))
+    assert exported.get_number_of_pins() == obj.get_number_of_pins()
+    with pytest.raises(ValueError):
+        obj.dump_excel(source)
+    assert source.read_bytes() == original
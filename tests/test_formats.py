@@ -0,0 +1,55 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from part_map.formats import UnknownFormatError, detect_format, file_filter
+from part_map.part_map import PartObject
+
+EXAMPLES = Path(__file__).parent.parent.joinpath("examples")
+
+
+def test_detect_by_suffix():
+    assert detect_format(EXAMPLES.joinpath("connector_example.json")).name == "json"
+    assert detect_format(EXAMPLES.joinpath("artix7_example.xlsx")).name == "excel"
+
+
+def test_detect_by_content(tmp_path):
+    filename = tmp_path.joinpath("not_a_netlist.txt")
+    filename.write_text(EXAMPLES.joinpath("connector_example.json").read_text())
+    assert detect_format(filename).name == "json"
+    assert PartObject.from_file(filename).get_number_of_pins() == 58
+
+    netlist = tmp_path.joinpath("board.dat")
+    netlist.write_text("GND; U1.A1 U2.1\n")
+    assert detect_format(netlist).name == "telesis"
+    assert PartObject.from_file(netlist, refdes="U1").get_number_of_pins() == 1
+
+
+def test_unknown_format(tmp_path):
+    filename = tmp_path.joinpath("image.png")
+    filename.write_bytes(b"\x89PNG\r\n")
+    with pytest.raises(UnknownFormatError):
+        PartObject.from_file(filename)
+
+
+def test_file_filter():
+    assert "*.xlsx" in file_filter().split(";;")[0]
+
+
+def test_json_only_imports_json():
+    modules = ["openpyxl", "part_map.excel", "part_map.telesis"]
+    script = (
+        "import sys; from part_map.object import PartObject; "
+        f"PartObject.from_file({str(EXAMPLES.joinpath('connector_example.json'))!r}); "
+        f"print([name for name in {modules!r} if name in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        cwd=Path(__file__).parent.parent,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,33 @@
+from part_map.history import EditHistory, PinEdit
+
+
+def test_undo_redo():
+    history = EditHistory()
+    history.record([PinEdit("A1", "name", "GND", "VCC")])
+    history.record([PinEdit("A1", "color", "#ffffff", "#ff0000")])
+    assert history.undo() == (PinEdit("A1", "color", "#ff0000", "#ffffff"),)
+    assert history.undo() == (PinEdit("A1", "name", "VCC", "GND"),)
+    assert history.undo() == tuple()
+    assert history.redo() == (PinEdit("A1", "name", "GND", "VCC"),)
+    history.record([PinEdit("B1", "name", "A", "B")])
+    assert not history.can_redo()
+
+
+def test_group_is_one_step():
+    history = EditHistory()
+    with history.group():
+        history.record([PinEdit("A1", "name", "GND", "VCC")])
+        with history.group():
+            history.record([PinEdit("A2", "name", "GND", "VCC")])
+        history.record([PinEdit("A3", "name", "GND", "GND")])  # Unchanged, not recorded.
+    assert [edit.number for edit in history.undo()] == ["A2", "A1"]
+    assert not history.can_undo()
+
+
+def test_max_depth():
+    history = EditHistory(max_depth=2)
+    for index in range(3):
+        history.record([PinEdit("A1", "name", str(index), str(index + 1))])
+    assert history.undo()[0].old == "3"
+    assert history.undo()[0].old == "2"
+    assert not history.can_undo()
@@ -0,0 +1,37 @@
+import logging
+
+from PySide2 import QtWidgets
+
+from part_map.logger import ThreadLogHandler, setup_logger
+
+
+def test_setup_logger_is_idempotent():
+    log = setup_logger("partmap.test_setup")
+    setup_logger("partmap.test_setup")
+    assert len(log.handlers) == 1
+
+
+def test_records_are_batched():
+    _ = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    handler = ThreadLogHandler(capacity=100)
+    log = logging.getLogger("partmap.test_batch")
+    log.setLevel(logging.DEBUG)
+    log.addHandler(handler)
+    wakes = list()
+    batches = list()
+    handler.log.wake.connect(lambda: wakes.append(True))
+    handler.new_records.connect(batches.append)
+    try:
+        for index in range(1000):
+            log.info(f"message {index}")
+        log.debug("below the handler's level")
+        handler.deliver()
+    finally:
+        log.removeHandler(handler)
+    assert len(wakes) == 1  # Only the first record schedules a delivery.
+    assert len(batches) == 1
+    assert batches[0][0] == ("WARNING", "900 log messages were dropped")
+    assert batches[0][1:] == [("INFO", f"message {index}") for index in range(900, 1000)]
+
+    handler.deliver()
+    assert len(batches) == 1  # Nothing new to deliver.
@@ -0,0 +1,52 @@
+from PySide2 import QtCore, QtGui
+
+from part_map.minimap import REFRESH_LIMIT, Minimap
+
+from .test_view import create_view
+
+
+def create_minimap():
+    view = create_view()
+    minimap = Minimap(view)
+    minimap.resize(200, 200)
+    minimap.show()
+    minimap.rebuild()
+    assert not minimap.pixmap.isNull()
+    return view, minimap
+
+
+def test_refresh_pins_does_not_rebuild(monkeypatch):
+    view, minimap = create_minimap()
+    rebuilds = list()
+    monkeypatch.setattr(minimap, "rebuild", lambda: rebuilds.append("rebuild"))
+    monkeypatch.setattr(minimap, "schedule_rebuild", lambda: rebuilds.append("schedule"))
+
+    pin = view.pin_items["A1"]
+    center = minimap.to_minimap(pin.sceneBoundingRect()).center().toPoint()
+    before = minimap.pixmap.toImage().pixelColor(center)
+    view.part.set_pin_color("A1", "#0000ff")
+    minimap.refresh_pins(["A1"])
+    assert rebuilds == []
+    assert minimap.pixmap.toImage().pixelColor(center) != before
+
+    minimap.refresh_pins((list(view.pin_items) * REFRESH_LIMIT)[: REFRESH_LIMIT + 1])
+    assert rebuilds == ["schedule"]
+
+
+def test_click_centers_view(monkeypatch):
+    view, minimap = create_minimap()
+    centered = list()
+    monkeypatch.setattr(view, "centerOn", centered.append)
+
+    target = view.pin_items["A1"].sceneBoundingRect()
+    point = minimap.to_minimap(target).center().toPoint()
+    event = QtGui.QMouseEvent(
+        QtCore.QEvent.MouseButtonPress,
+        QtCore.QPointF(point),
+        QtCore.Qt.LeftButton,
+        QtCore.Qt.LeftButton,
+        QtCore.Qt.NoModifier,
+    )
+    minimap.mousePressEvent(event)
+    assert centered == [minimap.to_scene(point)]
+    assert target.contains(centered[0])
@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import pytest
+
+from part_map.part_map import PartObject
+from part_map.pmap import PmapError, PmapPins
+
+
+def example():
+    return PartObject.from_json(
+        Path(__file__).parent.parent.joinpath("examples", "connector_example.json")
+    )
+
+
+def test_pmap_round_trip(tmp_path):
+    obj = example()
+    filename = tmp_path.joinpath("connector.pmap")
+    obj.dump_pmap(filename)
+    with PartObject.from_file(filename) as loaded:
+        assert loaded.get_number_of_pins() == obj.get_number_of_pins()
+        assert loaded.columns == obj.columns
+        assert loaded.rows == obj.rows
+        assert loaded.as_dict() == obj.as_dict()
+
+
+def test_pmap_is_lazy(tmp_path):
+    filename = tmp_path.joinpath("connector.pmap")
+    example().dump_pmap(filename)
+    pins = PmapPins(filename)
+    assert len(pins) == 58
+    assert not pins._decoded
+    assert pins["A1"] == {"name": "GND", "color": "#6F6F6F"}
+    assert list(pins._decoded) == ["A1"]
+    assert "Z99" not in pins
+    pins.close()
+
+
+def test_pmap_edits(tmp_path):
+    filename = tmp_path.joinpath("connector.pmap")
+    example().dump_pmap(filename)
+    obj = PartObject.from_pmap(filename)
+    obj.get_pin("A", "1")["name"] = "VCC"
+    obj.add_pin("A2", "TEST", "#000000")
+    obj.add_pin("E1", "NEW", "#000000")
+    assert obj.get_pin("A", "1")["name"] == "VCC"
+    assert obj.get_pin("A", "2")["name"] == "TEST"
+    assert obj.get_number_of_pins() == 59
+    assert len(list(obj.pins)) == 59
+
+    obj.dump_pmap(filename)  # Overwrite the file that is currently mapped.
+    assert obj.get_pin("A", "1")["name"] == "VCC"  # Still usable once unmapped.
+    with PartObject.from_pmap(filename) as reloaded:
+        assert reloaded.get_pin("A", "1")["name"] == "VCC"
+        assert reloaded.get_pin("E", "1")["name"] == "NEW"
+
+
+def test_pmap_to_json(tmp_path):
+    filename = tmp_path.joinpath("connector.pmap")
+    example().dump_pmap(filename)
+    with PartObject.from_pmap(filename) as obj:
+        obj.set_pin_color("A1", "#123456")
+        obj.dump_json()
+    loaded = PartObject.from_json(tmp_path.joinpath("connector.json"))
+    assert loaded.get_pin("A", "1") == {"name": "GND", "color": "#123456"}
+    assert loaded.as_dict() == dict(example().as_dict(), A1=loaded.get_pin("A", "1"))
+
+
+def test_pmap_refuses_to_drop_pins(tmp_path):
+    obj = example()
+    obj.add_pin("A1B", "EXTRA", "#000000")
+    filename = tmp_path.joinpath("connector.pmap")
+    with pytest.raises(PmapError, match="A1B"):
+        obj.dump_pmap(filename)
+    assert not filename.exists()
+    obj.dump_pmap(filename, skip_unplaced=True)
+    with PartObject.from_pmap(filename) as loaded:
+        assert loaded.get_number_of_pins() == 58
+
+
+def test_pmap_rejects_other_files(tmp_path):
+    filename = tmp_path.joinpath("bad.pmap")
+    filename.write_bytes(b"NOPE" + bytes(100))
+    with pytest.raises(PmapError):
+        PmapPins(filename)
@@ -0,0 +1,186 @@
+"""Golden image and performance regression tests, run with ``pytest --regression``.
+
+Each case is rendered by an offscreen PartViewer and compared against tests/golden/<case>.png
+after both are scaled down to GOLDEN_WIDTH and converted to gray, which smooths away
+antialiasing and hinting noise.  The time to build the scene, paint it and encode the png is
+compared against tests/golden/timings.json.  The tolerances are in tests/golden/config.json.
+
+Fonts and timings depend on the machine, so regenerate the golden files on the machine that
+runs the check with ``pytest --regression --update-golden`` and review the new images.
+"""
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+import pytest
+from PySide2 import QtCore, QtGui, QtWidgets
+
+from part_map.object import PartObject
+from part_map.view import PartViewer
+
+GOLDEN = Path(__file__).parent.joinpath("golden")
+EXAMPLES = Path(__file__).parent.parent.joinpath("examples")
+GOLDEN_WIDTH = 512
+COLORS = ["#ffffff", "#ff0000", "#00aa00", "#3366ff", "#ffcc00", "#999999"]
+
+
+def synthetic_part(size: int) -> PartObject:
+    """Create a size x size BGA with a repeating pattern of nets and colors."""
+    letters = "ABCDEFGHJKLMNPRTUVWY"  # BGA rows skip I, O, Q, S, X and Z.
+    rows = list(letters) + [first + second for first in letters for second in letters]
+    rows = rows[:size]
+    columns = [str(index + 1) for index in range(size)]
+    pins = dict()
+    for row_index, row in enumerate(rows):
+        for column_index, column in enumerate(columns):
+            kind = (row_index * 7 + column_index * 3) % len(COLORS)
+            pins[f"{row}{column}"] = {"name": f"NET_{kind}_{row}", "color": COLORS[kind]}
+    return PartObject(pins, f"synthetic_{size}.json", columns, rows)
+
+
+CASES: Dict[str, Tuple[Callable, Dict]] = {
+    "connector": (
+        lambda: PartObject.from_json(EXAMPLES.joinpath("connector_example.json")),
+        {"circles": False, "labels": True},
+    ),
+    "connector_circles": (
+        lambda: PartObject.from_json(EXAMPLES.joinpath("connector_example.json")),
+        {"circles": True, "labels": False},
+    ),
+    "artix7": (
+        lambda: PartObject.from_excel(EXAMPLES.joinpath("artix7_example.xlsx")),
+        {"circles": False, "labels": True},
+    ),
+    "synthetic_32": (lambda: synthetic_part(32), {"circles": True, "labels": True}),
+    "synthetic_96": (lambda: synthetic_part(96), {"circles": False, "labels": True}),
+}
+
+
+def load_json(name: str) -> Dict:
+    filename = GOLDEN.joinpath(name)
+    return json.loads(filename.read_text()) if filename.exists() else dict()
+
+
+def to_gray(image: QtGui.QImage) -> QtGui.QImage:
+    """Scale an image down to GOLDEN_WIDTH and convert it to 8 bit gray."""
+    return image.scaledToWidth(GOLDEN_WIDTH, QtCore.Qt.SmoothTransformation).convertToFormat(
+        QtGui.QImage.Format_Grayscale8
+    )
+
+
+def image_difference(image: QtGui.QImage, golden: QtGui.QImage, threshold: int) -> float:
+    """Return the fraction of pixels whose gray levels differ by more than the threshold."""
+    if image.size() != golden.size():
+        return 1.0
+    differ = 0
+    for row in range(image.height()):
+        # Rows are padded to 4 bytes, only compare the pixels.
+        line = bytes(image.constScanLine(row))[: image.width()]
+        golden_line = bytes(golden.constScanLine(row))[: golden.width()]
+        if line != golden_line:
+            differ += sum(abs(a - b) > threshold for a, b in zip(line, golden_line))
+    return differ / (image.width() * image.height())
+
+
+def best_of(repeat: int, function: Callable):
+    """Return the result of the function and the shortest of repeat calls."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def render_case(name: str, repeat: int) -> Tuple[QtGui.QImage, Dict[str, float]]:
+    """Render a case, timing the scene build, the paint and the png encode."""
+    loader, case_settings = CASES[name]
+    part = loader()
+    settings = {"rotate": False, "margin": 5, "filename": Path(f"{name}.png")}
+    settings.update(case_settings)
+
+    def build():
+        view = PartViewer()
+        view.setup(part, dict(settings))
+        return view
+
+    view, build_time = best_of(repeat, build)
+    image, paint_time = best_of(repeat, view.render_image)
+
+    def encode():
+        buffer = QtCore.QBuffer()
+        buffer.open(QtCore.QBuffer.WriteOnly)
+        image.save(buffer, "PNG")
+        return buffer
+
+    _, encode_time = best_of(repeat, encode)
+    return image, {"build": build_time, "paint": paint_time, "encode": encode_time}
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture(scope="module")
+def update(request):
+    return request.config.getoption("--update-golden")
+
+
+@pytest.fixture(scope="module")
+def timings(update):  # pylint: disable=W0621
+    """Collect the timings of every case and store them as the baseline when updating."""
+    measured: Dict[str, Dict] = dict()
+    yield measured
+    if measured and update:
+        baseline = load_json("timings.json")
+        baseline.update(measured)
+        GOLDEN.joinpath("timings.json").write_text(
+            json.dumps(baseline, indent=4, sort_keys=True) + "\n"
+        )
+
+
+@pytest.mark.regression
+@pytest.mark.parametrize("name", list(CASES))
+def test_render(app, update, timings, name):  # pylint: disable=W0621
+    del app  # Only needed to exist.
+    config = load_json("config.json")
+    image, measured = render_case(name, config["repeat"])
+    timings[name] = measured
+    golden_file = GOLDEN.joinpath(f"{name}.png")
+    if update:
+        GOLDEN.mkdir(exist_ok=True)
+        to_gray(image).save(str(golden_file))
+        return
+
+    assert golden_file.exists(), f"No golden image for {name}, run with --update-golden"
+    golden = QtGui.QImage(str(golden_file)).convertToFormat(QtGui.QImage.Format_Grayscale8)
+    difference = image_difference(to_gray(image), golden, config["pixel_threshold"])
+    assert (
+        difference <= config["max_pixel_fraction"]
+    ), f"{difference:.2%} of the pixels of {name} differ from {golden_file}"
+
+    baseline = load_json("timings.json").get(name)
+    assert baseline, f"No baseline timings for {name}, run with --update-golden"
+    for stage, seconds in measured.items():
+        limit = baseline[stage] * config["max_slowdown"] + config["slack"]
+        assert seconds <= limit, (
+            f"{name} {stage} took {seconds * 1000:.1f} ms, the limit is {limit * 1000:.1f} ms "
+            f"({baseline[stage] * 1000:.1f} ms baseline)"
+        )
+
+
+def test_image_difference(app):  # pylint: disable=W0621
+    del app
+    image = QtGui.QImage(100, 50, QtGui.QImage.Format_Grayscale8)
+    image.fill(QtCore.Qt.white)
+    golden = image.copy()
+    assert image_difference(image, golden, 16) == 0.0
+    painter = QtGui.QPainter(image)
+    painter.fillRect(0, 0, 10, 10, QtCore.Qt.black)
+    painter.fillRect(20, 0, 10, 10, QtGui.QColor(250, 250, 250))  # Within the threshold.
+    painter.end()
+    assert image_difference(image, golden, 16) == 100 / 5000
+    assert image_difference(image.scaled(50, 50), golden, 16) == 1.0
@@ -0,0 +1,96 @@
+import shutil
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from PySide2 import QtWidgets
+
+from part_map import cli
+from part_map.object import PartObject
+from part_map.render_cache import MANIFEST_NAME, RenderManifest, render_key
+from part_map.view import PartViewer, export_key
+
+EXAMPLE = Path(__file__).parent.parent.joinpath("examples", "connector_example.json")
+
+SETTINGS = {"circles": False, "labels": True, "rotate": False, "font_size": 12, "box_size": 50}
+
+
+def create_part():
+    pins = {"A1": {"name": "GND", "color": "#ffffff"}, "A2": {"name": "VCC", "color": "#ffffff"}}
+    return PartObject(pins, "part.json")
+
+
+def test_render_key():
+    part = create_part()
+    key = render_key(part, SETTINGS, "png")
+    assert key == render_key(create_part(), dict(SETTINGS, refdes="U1"), "png")
+    assert key != render_key(part, dict(SETTINGS, circles=True), "png")
+    assert key != render_key(part, dict(SETTINGS, box_size=60), "png")
+    assert key != render_key(part, SETTINGS, "svg")
+    part.set_pin_color("A1", "#000000")
+    assert key != render_key(part, SETTINGS, "png")
+
+
+def test_render_key_of_pmap(tmp_path):
+    filename = tmp_path.joinpath("part.pmap")
+    create_part().dump_pmap(filename)
+    with PartObject.from_pmap(filename) as part, PartObject.from_pmap(filename) as reopened:
+        key = render_key(part, SETTINGS, "png")
+        assert key == render_key(reopened, SETTINGS, "png")
+        assert key == render_key(create_part(), SETTINGS, "png")
+        part.set_pin_color("A1", "#000000")
+        assert key != render_key(part, SETTINGS, "png")
+
+
+def test_manifest(tmp_path):
+    output = tmp_path.joinpath("part.png")
+    manifest = RenderManifest(tmp_path)
+    assert not manifest.is_current(output, "key")
+    output.write_bytes(b"image")
+    manifest.record(output, "key")
+
+    manifest = RenderManifest(tmp_path)
+    assert manifest.is_current(output, "key")
+    assert not manifest.is_current(output, "other")
+    output.write_bytes(b"changed by something else")
+    assert not manifest.is_current(output, "key")
+
+
+def test_corrupt_manifest(tmp_path):
+    tmp_path.joinpath(MANIFEST_NAME).write_text("{")
+    assert RenderManifest(tmp_path).entries == dict()
+
+
+@pytest.mark.parametrize("rotate", [False, True])
+def test_export_key_matches_view(rotate):
+    _ = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    settings = {"circles": False, "labels": True, "rotate": rotate, "filename": Path("x.json")}
+    expected = export_key(PartObject.from_json(EXAMPLE), settings)
+    view = PartViewer()
+    view.setup(PartObject.from_json(EXAMPLE), dict(settings, margin=5))
+    assert render_key(view.part, view.render_settings(), "png") == expected
+
+
+def test_save_failure_is_not_recorded(tmp_path):
+    _ = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    view = PartViewer()
+    filename = tmp_path.joinpath("missing", "part.json")
+    settings = {"circles": False, "labels": True, "rotate": False, "margin": 5}
+    view.setup(PartObject.from_json(EXAMPLE), dict(settings, filename=filename))
+    view.save()
+    assert not filename.parent.exists()
+
+
+def test_cli_skips_current_image(tmp_path, monkeypatch):
+    filename = tmp_path.joinpath("connector.json")
+    shutil.copy(EXAMPLE, filename)
+    runner = CliRunner()
+    assert runner.invoke(cli.map, ["load", str(filename), "-n", "-s"]).exit_code == 0
+    assert filename.with_suffix(".png").exists()
+
+    def no_window(*args):
+        raise AssertionError("The image is up to date, no window should be built")
+
+    monkeypatch.setattr(cli, "PartMap", no_window)
+    result = runner.invoke(cli.map, ["load", str(filename), "-n", "-s"])
+    assert result.exit_code == 0, result.output
@@ -0,0 +1,107 @@
+import json
+import threading
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+from PySide2 import QtWidgets
+
+from part_map.object import PartObject
+from part_map.server import LRUCache, RenderDispatcher, RenderServer
+
+EXAMPLES = Path(__file__).parent.parent.joinpath("examples")
+
+
+def test_lru_cache_eviction():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used entry
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_serve_json():
+    server = RenderServer(("127.0.0.1", 0), dispatcher=None)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    filename = Path(__file__).parent.parent.joinpath("examples", "connector_example.json")
+    url = f"http://127.0.0.1:{server.server_address[1]}/render?format=json&path={filename}"
+    try:
+        with urlopen(url) as response:
+            pins = json.loads(response.read())
+        assert len(pins) == 58
+        with urlopen(url) as response:
+            assert json.loads(response.read()) == pins
+        assert len(server.parts) == 1
+        assert len(server.renders) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def render_server():
+    _ = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    server = RenderServer(("127.0.0.1", 0), RenderDispatcher())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def fetch(server, query, data=None):
+    """Request a render, running the Qt event loop so the dispatcher can paint meanwhile."""
+    url = f"http://127.0.0.1:{server.server_address[1]}/render?{query}"
+    result = dict()
+
+    def request():
+        try:
+            with urlopen(Request(url, data=data)) as response:
+                result["body"] = response.read()
+        except HTTPError as error:
+            result["error"] = error
+
+    thread = threading.Thread(target=request)
+    thread.start()
+    while thread.is_alive():
+        QtWidgets.QApplication.processEvents()
+        thread.join(0.01)
+    if "error" in result:
+        raise result["error"]
+    return result["body"]
+
+
+def test_serve_png_and_svg(render_server):  # pylint: disable=W0621
+    filename = EXAMPLES.joinpath("connector_example.json")
+    assert fetch(render_server, f"format=png&path={filename}").startswith(b"\x89PNG")
+    assert b"<svg" in fetch(render_server, f"format=svg&rotate=1&path={filename}")
+    assert len(render_server.renders) == 2
+
+
+def test_serve_pmap_upload(render_server, tmp_path):  # pylint: disable=W0621
+    filename = tmp_path.joinpath("connector.pmap")
+    PartObject.from_json(EXAMPLES.joinpath("connector_example.json")).dump_pmap(filename)
+    body = fetch(render_server, "format=json&filename=connector.pmap", filename.read_bytes())
+    assert len(json.loads(body)) == 58
+    assert list(render_server.parts._entries.values())[0].filename == Path("connector.pmap")
+
+
+def test_serve_errors(render_server, monkeypatch):  # pylint: disable=W0621
+    with pytest.raises(HTTPError) as error:
+        fetch(render_server, "format=png&filename=part.xlsx", b"not a part")
+    assert error.value.code == 400
+    assert "part.xlsx is not a recognized part file" in error.value.read().decode()
+
+    def broken(*args):
+        raise OSError("disk on fire")
+
+    monkeypatch.setattr(render_server, "get_part", broken)
+    with pytest.raises(HTTPError) as error:
+        fetch(render_server, "format=png&filename=other.json", b"{}")
+    assert error.value.code == 500
+    assert "disk on fire" not in error.value.read().decode()
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+from part_map.part_map import PartObject
+from part_map.stats import GROUND, POWER, SIGNAL, classify_net
+
+
+def example():
+    return PartObject.from_json(
+        Path(__file__).parent.parent.joinpath("examples", "connector_example.json")
+    )
+
+
+def test_classify_net():
+    assert classify_net("GND") == GROUND
+    assert classify_net("AGND") == GROUND
+    assert classify_net("VCCO_34") == POWER
+    assert classify_net("MGTAVCC") == POWER
+    assert classify_net("3V3") == POWER
+    assert classify_net("USB_GND") == GROUND
+    assert classify_net("USB_VCC") == POWER
+    assert classify_net("P1V8_AUX") == POWER
+    assert classify_net("SIGNAL1") == SIGNAL
+    assert classify_net("CLK_RESET_L") == SIGNAL
+    assert classify_net("IO_L6N_T0_VREF_34") == SIGNAL
+    assert classify_net("DIFF_P") == SIGNAL
+    assert classify_net(None) == SIGNAL
+
+
+def test_statistics():
+    summary = example().statistics.summary()
+    assert summary["pins"] == 58
+    assert summary["power"] == summary["nets"]["USB_VCC"]
+    assert summary["nets"]["GND"] + summary["nets"]["USB_GND"] == summary["ground"]
+    assert sum(summary["nets"].values()) == 58
+    assert sum(region["pins"] for region in summary["regions"].values()) == 58
+
+
+def test_incremental_statistics():
+    obj = example()
+    statistics = obj.statistics
+    obj.set_pin_name("A2", "GND")
+    obj.add_pin("A3", "VCC", "#ff0000")
+    obj.add_pin("E1", "GND", "#ff0000")
+    assert statistics.summary() == obj.count_statistics().summary()
@@ -0,0 +1,37 @@
+from part_map.part_map import PartObject
+from part_map.telesis import parse_telesis, split_ranges
+
+NETLIST = """$PACKAGES
+BGA ! XC7A ; U1
+$NETS
+GND; U1.A1 U1.B2 R1.1 ,
+     U1.C3 U1.D4 ,
+     U1.E5
+VCC; U1.A2
+     U1.B3
+CLK; R2.2 U1.C1
+$END
+"""
+
+
+def test_telesis_continuation_lines(tmp_path):
+    filename = tmp_path.joinpath("board.net")
+    filename.write_text(NETLIST)
+    obj = PartObject.from_telesis(filename, "U1", workers=1)
+    assert obj.get_pin("A", "1")["name"] == "GND"
+    assert obj.get_pin("E", "5")["name"] == "GND"
+    assert obj.get_pin("A", "2")["name"] == "VCC"
+    assert obj.get_pin("B", "3") is None  # The VCC line doesn't end with a comma.
+    assert obj.get_pin("C", "1")["name"] == "CLK"
+    assert obj.get_number_of_pins() == 7
+
+
+def test_telesis_chunks_match_sequential(tmp_path):
+    filename = tmp_path.joinpath("board.net")
+    filename.write_text(NETLIST * 3)
+    sequential = parse_telesis(filename, "U1", workers=1)
+    for workers in range(2, 12):
+        assert len(split_ranges(filename, workers, min_chunk_size=1)) > 1
+        chunked = parse_telesis(filename, "U1", workers=workers, min_chunk_size=1)
+        assert chunked == sequential
+        assert list(chunked) == list(sequential)
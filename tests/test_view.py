@@ -0,0 +1,92 @@
+import os
+from pathlib import Path
+
+import pytest
+from PySide2 import QtWidgets
+
+from part_map.object import PartObject
+from part_map.pins.bulk import expand_names
+from part_map.view import PartViewer
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def create_view():
+    _ = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    filename = Path(__file__).parent.parent.joinpath("examples", "connector_example.json")
+    view = PartViewer()
+    settings = {"circles": False, "labels": True, "rotate": False, "filename": filename}
+    view.setup(PartObject.from_json(filename), settings)
+    return view
+
+
+def test_grid_rect_covers_items():
+    view = create_view()
+    rect = view.grid_rect()
+    assert rect.width() == view.settings["image_width"]
+    assert rect.height() == view.settings["image_height"]
+    for pin in view.pin_items.values():
+        assert rect.contains(pin.sceneBoundingRect())
+
+
+def test_undo_bulk_edit():
+    view = create_view()
+    numbers = list(view.pin_items)[:3]
+    before = {number: dict(view.part.get_pin(number, "")) for number in numbers}
+    edited = list()
+    view.pin_edited.connect(edited.append)
+
+    view.edit_pins({number: {"color": "#ff0000"} for number in numbers})
+    view.edit_pin(numbers[0], name="RENAMED")
+    assert edited == [numbers, numbers[:1]]
+    assert view.part.get_pin(numbers[0], "") == {"name": "RENAMED", "color": "#ff0000"}
+
+    view.undo()
+    view.undo()
+    assert {number: view.part.get_pin(number, "") for number in numbers} == before
+    view.redo()
+    assert all(view.part.get_pin(number, "")["color"] == "#ff0000" for number in numbers)
+
+
+def test_select_and_bulk_edit():
+    view = create_view()
+    view.set_select_mode(True)
+    assert view.dragMode() == QtWidgets.QGraphicsView.RubberBandDrag
+    first, second = sorted(view.pin_items)[:2]
+    changes = list()
+    view.scene.selectionChanged.connect(lambda: changes.append(True))
+
+    view.select_pins([first])
+    assert view.selected_numbers() == [first]
+    name = view.part.get_pin(first, "")["name"]
+    numbers = view.select_net()
+    assert first in numbers
+    assert all(view.part.get_pin(number, "")["name"] == name for number in numbers)
+    assert changes == [True, True]  # One notification per selection, not per pin.
+
+    edited = list()
+    view.pin_edited.connect(edited.append)
+    view.select_pins([first, second])
+    view.edit_selected(name="{name}_{n}", color="#00ff00")
+    assert edited == [[first, second]]
+    assert view.part.get_pin(second, "")["name"].endswith("_1")
+    assert view.part.get_pin(first, "")["color"] == "#00ff00"
+
+    with pytest.raises(ValueError):
+        view.edit_selected(name="{missing}")
+    assert view.part.get_pin(first, "")["name"] == f"{name}_0"  # Nothing changed.
+    view.undo()
+    assert view.part.get_pin(first, "")["name"] == name
+
+
+def test_expand_names():
+    pins = [("A1", "NET"), ("AB12", "DQ")]
+    assert expand_names("DQ{n}", pins) == ["DQ0", "DQ1"]
+    assert expand_names("{name}_{row}{column}", pins) == ["NET_A1", "DQ_AB12"]
+    assert expand_names("GND", pins) == ["GND", "GND"]
+    with pytest.raises(ValueError):
+        expand_names("{0}", pins)
+    with pytest.raises(ValueError):
+        expand_names("{name.foo}", pins)
+    with pytest.raises(ValueError):
+        expand_names("{n[0]}", pins)